@@ -4,11 +4,84 @@
 负责证件状态计算、提醒规则匹配等核心业务逻辑。
 """
 
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import date
-from ..data.csv_processor import PersonDocument
+
+import numpy as np
+
+from ..data.csv_processor import DocumentFrame, PersonDocument
 from ..utils.date_utils import DateUtils
 from ..utils.logger import get_logger
+from .status_kernel import (
+    COLOR_UNKNOWN, DISPLAY_COLORS, PRIORITY_UNKNOWN, STATUS_LABELS, classify, priority_bucket
+)
+
+
+# "已办理"备注（CSV读取的备注已去除首尾空白并驻留，strip后比较时直接命中同一对象）
+_ALREADY_DONE = sys.intern("已办理")
+
+# 报告排序用的状态等级：已过期、即将过期在前，其余（有效、未知）在后
+_STATUS_RANK = {"已过期": 0, "即将过期": 1}
+
+
+@dataclass
+class _DocumentColumns:
+    """证件列式数据，各数组与证件列表按行一一对应"""
+    documents: List[PersonDocument]
+    days_left: np.ndarray       # 剩余天数（int64，未知时为0）
+    known: np.ndarray           # 剩余天数是否已知
+    remarks_done: np.ndarray    # 备注是否为"已办理"
+
+
+def _category_codes(documents: List[PersonDocument], code_attr: str, value_attr: str) -> np.ndarray:
+    """
+    获取证件某个字符串字段的整数分类编码
+    
+    优先使用CSV读取时已分配的编码（编码只在同一CSVProcessor读取的证件之间一致）；
+    若存在未编码的证件，则对整个列表重新编码。
+    
+    Args:
+        documents: 证件文档列表
+        code_attr: 编码字段名
+        value_attr: 原始字符串字段名
+        
+    Returns:
+        每行的编码数组
+    """
+    codes = [getattr(doc, code_attr) for doc in documents]
+    if None not in codes:
+        return np.array(codes, dtype=np.int64)
+    
+    values = np.array([getattr(doc, value_attr) for doc in documents], dtype=object)
+    _, inverse = np.unique(values, return_inverse=True)
+    return inverse.reshape(-1)
+
+
+def _group_rows(items: List[PersonDocument], codes: np.ndarray, key_attr: str) -> Dict[str, List[PersonDocument]]:
+    """
+    按分类编码分组，分组顺序与各组首次出现的顺序一致
+    
+    Args:
+        items: 待分组的证件列表
+        codes: 每个证件的分类编码
+        key_attr: 作为分组键的字段名（每组只取一次）
+        
+    Returns:
+        分组键到证件列表的字典
+    """
+    if not items:
+        return {}
+    
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+    groups = np.split(order, boundaries)
+    # 稳定排序保证每组内的行号递增，组内第一个行号即首次出现位置
+    groups.sort(key=lambda rows: rows[0])
+    return {getattr(items[rows[0]], key_attr): [items[i] for i in rows.tolist()] for rows in groups}
 
 
 class ReminderLogic:
@@ -22,31 +95,56 @@ class ReminderLogic:
             logger: 日志记录器，如果为None则创建默认记录器
         """
         self.logger = logger or get_logger(__name__)
+        # 最近一次状态计算得到的列式数据
+        self._columns: Optional[_DocumentColumns] = None
     
     def calculate_document_status(self, documents: List[PersonDocument], 
-                                days_until_expiring_threshold: int = 30) -> List[PersonDocument]:
+                                days_until_expiring_threshold: int = 30,
+                                today: Optional[date] = None,
+                                frame: Optional[DocumentFrame] = None) -> List[PersonDocument]:
         """
-        计算所有证件的状态信息（剩余天数、状态）
+        计算所有证件的状态信息（剩余天数、状态、排序等级和显示颜色）
         
         Args:
             documents: 证件文档列表
             days_until_expiring_threshold: 即将过期的天数阈值
+            today: 计算基准日期，如果为None则取当天（整个批次只取一次）
+            frame: CSV读取时得到的列式数据，是同一证件列表的列式数据时直接使用其中的到期日期
             
         Returns:
             更新了状态信息的证件文档列表
         """
         self.logger.info(f"开始计算 {len(documents)} 个证件的状态信息")
         
-        for doc in documents:
-            if doc.expiry_date:
-                # 计算剩余天数
-                doc.days_left = DateUtils.calculate_days_left(doc.expiry_date)
-                
-                # 判断证件状态
-                doc.status = self._get_document_status(doc.days_left, days_until_expiring_threshold)
-            else:
-                doc.days_left = None
-                doc.status = "未知"
+        if today is None:
+            today = DateUtils.get_today()
+        
+        # 将到期日期整体转换为 datetime64[D] 数组，一次性计算剩余天数
+        if frame is not None and frame.matches(documents):
+            expiry = frame.expiry_date
+        else:
+            expiry = np.array(
+                [doc.expiry_date if doc.expiry_date else np.datetime64('NaT') for doc in documents],
+                dtype='datetime64[D]'
+            )
+        missing = np.isnat(expiry)
+        days_left = DateUtils.calculate_days_left_bulk(expiry, today)
+        
+        # 批量分类得到状态编码：0=已过期，1=即将过期，2=有效，3=未知
+        # 同时得到显示颜色编码，渲染时直接读取字段而无需再次判断
+        status_codes, _, colors, _ = classify(days_left, ~missing, -1, days_until_expiring_threshold)
+        
+        for doc, days, code, color, is_missing in zip(
+                documents, days_left.tolist(), status_codes.tolist(),
+                colors.tolist(), missing.tolist()):
+            doc.days_left = None if is_missing else days
+            doc.status = STATUS_LABELS[code]
+            doc.status_rank = min(code, 2)
+            doc.display_color = DISPLAY_COLORS[color]
+        
+        # 保留列式数据，供后续筛选直接使用
+        days_left[missing] = 0
+        self._columns = self._build_columns(documents, days_left, ~missing)
         
         # 统计状态信息
         status_counts = self._count_status_distribution(documents)
@@ -68,27 +166,31 @@ class ReminderLogic:
         """
         self.logger.info(f"筛选需要提醒的证件，提醒节点: {reminder_days}")
         
-        reminder_documents = []
+        columns = self._get_columns(documents)
         
-        for doc in documents:
-            if doc.days_left is not None:
-                # 检查备注字段，如果是"已办理"，则不需要提醒
-                if doc.remarks and doc.remarks.strip() == "已办理":
-                    doc.needs_reminder = False
-                    self.logger.debug(f"{doc.person_name}的{doc.document_type}备注为'已办理'，跳过提醒")
-                else:
-                    # 判断是否需要提醒
-                    doc.needs_reminder = self._needs_reminder(doc.days_left, reminder_days)
-                
-                if doc.needs_reminder:
-                    reminder_documents.append(doc)
-            else:
-                doc.needs_reminder = False
+        if reminder_days:
+            # 最大提醒天数只计算一次
+            _, _, _, needs = classify(columns.days_left, columns.known, max(reminder_days), 0)
+        else:
+            # 未设置提醒天数时只有已过期的证件需要提醒，无需逐个分类
+            needs = columns.known & (columns.days_left < 0)
         
-        self.logger.info(f"共有 {len(reminder_documents)} 个证件需要提醒")
+        # 备注为"已办理"的证件不需要提醒
+        skipped = needs & columns.remarks_done
+        for i in np.flatnonzero(skipped).tolist():
+            doc = documents[i]
+            self.logger.debug(f"{doc.person_name}的{doc.document_type}备注为'已办理'，跳过提醒")
+        
+        mask = needs & ~columns.remarks_done
+        for doc, needs_reminder in zip(documents, mask.tolist()):
+            doc.needs_reminder = needs_reminder
         
-        # 按剩余天数排序（已过期的在前面，天数越少越靠前）
-        reminder_documents.sort(key=lambda x: x.days_left if x.days_left is not None else -999)
+        # 按剩余天数排序（已过期的在前面，天数越少越靠前），稳定排序保持原有相对顺序
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(columns.days_left[rows], kind='stable')]
+        reminder_documents = [documents[i] for i in rows.tolist()]
+        
+        self.logger.info(f"共有 {len(reminder_documents)} 个证件需要提醒")
         
         return reminder_documents
     
@@ -112,8 +214,8 @@ class ReminderLogic:
                 'by_document_type': {}
             }
         
-        # 按剩余天数分类统计
-        by_days_left = {}
+        # 按剩余天数分组并计数
+        by_days_left = defaultdict(list)
         expired_count = 0
         expiring_count = 0
         
@@ -122,35 +224,23 @@ class ReminderLogic:
             if days_left is not None:
                 if days_left < 0:
                     expired_count += 1
+                    days_key = f"已过期{-days_left}天"
                 else:
                     expiring_count += 1
-                
-                days_key = f"{days_left}天" if days_left >= 0 else f"已过期{abs(days_left)}天"
-                if days_key not in by_days_left:
-                    by_days_left[days_key] = []
+                    days_key = f"{days_left}天"
                 by_days_left[days_key].append(doc)
         
-        # 按人员分类统计
-        by_person = {}
-        for doc in reminder_documents:
-            person_name = doc.person_name
-            if person_name not in by_person:
-                by_person[person_name] = []
-            by_person[person_name].append(doc)
-        
-        # 按证件类型分类统计
-        by_document_type = {}
-        for doc in reminder_documents:
-            doc_type = doc.document_type
-            if doc_type not in by_document_type:
-                by_document_type[doc_type] = []
-            by_document_type[doc_type].append(doc)
+        # 按人员、证件类型分组：使用整数编码排序切分，每组只映射一次字符串键
+        person_idx = _category_codes(reminder_documents, 'person_code', 'person_name')
+        doc_type_idx = _category_codes(reminder_documents, 'doc_type_code', 'document_type')
+        by_person = _group_rows(reminder_documents, person_idx, 'person_name')
+        by_document_type = _group_rows(reminder_documents, doc_type_idx, 'document_type')
         
         summary = {
             'total_count': len(reminder_documents),
             'expired_count': expired_count,
             'expiring_count': expiring_count,
-            'by_days_left': by_days_left,
+            'by_days_left': dict(by_days_left),
             'by_person': by_person,
             'by_document_type': by_document_type
         }
@@ -170,9 +260,19 @@ class ReminderLogic:
         Returns:
             用于生成报告的数据列表
         """
-        report_data = []
+        # 先用(状态等级, 剩余天数, 证件)元组排序，比较的都是整数
+        keyed = [
+            (
+                doc.status_rank if doc.status_rank is not None else _STATUS_RANK.get(doc.status, 2),
+                doc.days_left if doc.days_left is not None else 999,
+                doc
+            )
+            for doc in documents
+        ]
+        keyed.sort(key=itemgetter(0, 1))
         
-        for doc in documents:
+        report_data = []
+        for _, _, doc in keyed:
             row_data = {
                 'person_name': doc.person_name,
                 'document_type': doc.document_type,
@@ -184,54 +284,46 @@ class ReminderLogic:
             }
             report_data.append(row_data)
         
-        # 按状态和剩余天数排序
-        report_data.sort(key=lambda x: (
-            0 if x['status'] == '已过期' else (1 if x['status'] == '即将过期' else 2),
-            x['days_left'] if isinstance(x['days_left'], int) else 999
-        ))
-        
         return report_data
     
-    def _get_document_status(self, days_left: int, threshold: int) -> str:
+    def _build_columns(self, documents: List[PersonDocument], days_left: np.ndarray,
+                       known: np.ndarray) -> _DocumentColumns:
         """
-        获取证件状态
+        构建证件列式数据
         
         Args:
-            days_left: 剩余天数
-            threshold: 即将过期阈值
+            documents: 证件文档列表
+            days_left: 剩余天数数组
+            known: 剩余天数是否已知
             
         Returns:
-            证件状态字符串
+            列式数据对象
         """
-        if days_left < 0:
-            return "已过期"
-        elif days_left <= threshold:
-            return "即将过期"  
-        else:
-            return "有效"
+        # 不是由CSV读取得到的证件备注可能带有首尾空白，比较前仍需去除
+        remarks_done = np.array([bool(doc.remarks) and doc.remarks.strip() == _ALREADY_DONE
+                                 for doc in documents], dtype=bool)
+        
+        return _DocumentColumns(
+            documents=documents,
+            days_left=days_left,
+            known=known,
+            remarks_done=remarks_done
+        )
     
-    def _needs_reminder(self, days_left: int, reminder_days: List[int]) -> bool:
+    def _get_columns(self, documents: List[PersonDocument]) -> _DocumentColumns:
         """
-        判断是否需要发送提醒
+        获取证件列表对应的列式数据
         
-        Args:
-            days_left: 剩余天数
-            reminder_days: 提醒天数列表
-            
-        Returns:
-            是否需要提醒
+        如果是最近一次状态计算的同一列表则直接复用，否则根据证件的计算字段重新构建。
         """
-        # 已过期的证件需要提醒
-        if days_left < 0:
-            return True
-        
-        # 如果没有设置提醒天数，则不提醒
-        if not reminder_days:
-            return False
-        
-        # 剩余天数小于等于最大提醒天数的证件需要提醒
-        max_reminder_days = max(reminder_days)
-        return days_left <= max_reminder_days
+        columns = self._columns
+        if columns is not None and columns.documents is documents and len(columns.days_left) == len(documents):
+            return columns
+        
+        known = np.array([doc.days_left is not None for doc in documents], dtype=bool)
+        days_left = np.array([doc.days_left if doc.days_left is not None else 0 for doc in documents],
+                             dtype=np.int64)
+        return self._build_columns(documents, days_left, known)
     
     def _count_status_distribution(self, documents: List[PersonDocument]) -> Dict[str, int]:
         """
@@ -243,12 +335,7 @@ class ReminderLogic:
         Returns:
             状态分布统计
         """
-        status_counts = {}
-        for doc in documents:
-            status = doc.status or "未知"
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        return status_counts
+        return dict(Counter(doc.status or "未知" for doc in documents))
     
     def get_priority_level(self, days_left: Optional[int]) -> int:
         """
@@ -261,18 +348,10 @@ class ReminderLogic:
             优先级等级（数字越小优先级越高）
         """
         if days_left is None:
-            return 999  # 最低优先级
-        
-        if days_left < 0:
-            return 0    # 已过期，最高优先级
-        elif days_left <= 1:
-            return 1    # 1天内到期
-        elif days_left <= 7:
-            return 2    # 7天内到期
-        elif days_left <= 30:
-            return 3    # 30天内到期
-        else:
-            return 4    # 其他情况
+            return PRIORITY_UNKNOWN  # 最低优先级
+        
+        # 0=已过期，1=1天内到期，2=7天内到期，3=30天内到期，4=其他情况
+        return priority_bucket(days_left)
     
     def get_display_color(self, days_left: Optional[int]) -> str:
         """
@@ -285,15 +364,7 @@ class ReminderLogic:
             CSS颜色值
         """
         if days_left is None:
-            return "#666666"  # 灰色
-        
-        if days_left < 0:
-            return "#dc3545"  # 红色 - 已过期
-        elif days_left <= 1:
-            return "#dc3545"  # 红色 - 紧急
-        elif days_left <= 7:
-            return "#fd7e14"  # 橙色 - 警告
-        elif days_left <= 30:
-            return "#ffc107"  # 黄色 - 注意
-        else:
-            return "#28a745"  # 绿色 - 正常 
\ No newline at end of file
+            return DISPLAY_COLORS[COLOR_UNKNOWN]  # 灰色
+        
+        # 红色(已过期/紧急)、橙色(警告)、黄色(注意)、绿色(正常) 按优先级分段取色
+        return DISPLAY_COLORS[priority_bucket(days_left)]
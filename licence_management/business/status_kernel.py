@@ -0,0 +1,125 @@
+"""
+证件分类内核模块
+
+按剩余天数对证件进行批量分类，一次循环同时得到状态、优先级、显示颜色和提醒标记。
+默认使用 NumPy 向量化实现；证件数量很大且安装了 numba 时，改用 JIT 编译并按证件多线程并行的循环。
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+# 证件数量达到该值时才使用 numba 内核；数量较少时 NumPy 实现几乎不耗时，
+# 不值得承担导入 numba 和 JIT 编译（每个进程数百毫秒）的开销
+NUMBA_MIN_ROWS = 1_000_000
+
+
+# 状态编码对应的状态文本（3 表示缺少到期日期）
+STATUS_LABELS = ("已过期", "即将过期", "有效", "未知")
+
+# 颜色编码对应的CSS颜色值（与优先级0-4一一对应，5 表示未知）
+DISPLAY_COLORS = ("#dc3545", "#dc3545", "#fd7e14", "#ffc107", "#28a745", "#666666")
+
+# 未知剩余天数的优先级（最低优先级）
+PRIORITY_UNKNOWN = 999
+
+STATUS_UNKNOWN = 3
+COLOR_UNKNOWN = 5
+
+
+def priority_bucket(days_left: int) -> int:
+    """
+    无分支地计算剩余天数所在的优先级分段
+
+    分段边界为 0、1、7、30 天：四个比较结果相加直接得到 0-4。
+
+    Args:
+        days_left: 剩余天数
+
+    Returns:
+        优先级分段（0=已过期，1=1天内，2=7天内，3=30天内，4=其他）
+    """
+    return (days_left >= 0) + (days_left > 1) + (days_left > 7) + (days_left > 30)
+
+
+def _classify_numpy(days, known, max_reminder, threshold, status, priority, color, needs):
+    """NumPy 向量化实现（证件数量较少或未安装 numba 时使用）"""
+    status[:] = np.where(days < 0, 0, np.where(days <= threshold, 1, 2))
+    # 布尔数组相加仍是布尔数组，需先转换为整数再累加
+    level = ((days >= 0).astype(np.int16) + (days > 1) + (days > 7) + (days > 30))
+    needs[:] = known & ((days < 0) | (days <= max_reminder))
+
+    status[~known] = STATUS_UNKNOWN
+    priority[:] = np.where(known, level, PRIORITY_UNKNOWN)
+    color[:] = np.where(known, level, COLOR_UNKNOWN)
+
+
+@lru_cache(maxsize=None)
+def _numba_classify():
+    """
+    获取 numba 编译的分类内核（首次处理大量证件时才导入 numba）
+
+    Returns:
+        编译后的内核函数，未安装 numba 时返回None
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:  # numba 为可选依赖
+        return None
+
+    @njit(parallel=True, cache=True)
+    def classify_loop(days, known, max_reminder, threshold, status, priority, color, needs):
+        """逐个证件分类的循环实现（各证件之间无依赖，按证件并行）"""
+        for i in prange(days.shape[0]):
+            if not known[i]:
+                status[i] = STATUS_UNKNOWN
+                priority[i] = PRIORITY_UNKNOWN
+                color[i] = COLOR_UNKNOWN
+                needs[i] = False
+                continue
+
+            d = days[i]
+            if d < 0:
+                status[i] = 0
+            elif d <= threshold:
+                status[i] = 1
+            else:
+                status[i] = 2
+
+            level = int(d >= 0) + int(d > 1) + int(d > 7) + int(d > 30)
+            priority[i] = level
+            color[i] = level
+
+            needs[i] = d < 0 or d <= max_reminder
+
+    return classify_loop
+
+
+def classify(days: np.ndarray, known: np.ndarray, max_reminder: int,
+             threshold: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量计算证件的状态、优先级、颜色编码和提醒标记
+
+    Args:
+        days: 剩余天数数组（int64）
+        known: 剩余天数是否有效的布尔数组
+        max_reminder: 最大提醒天数，-1 表示只提醒已过期的证件
+        threshold: 即将过期的天数阈值
+
+    Returns:
+        (状态编码, 优先级, 颜色编码, 是否需要提醒) 四个数组
+    """
+    days = np.ascontiguousarray(days, dtype=np.int64)
+    n = days.shape[0]
+
+    # 输出数组预先分配，由内核按行填充
+    status = np.empty(n, dtype=np.int8)
+    priority = np.empty(n, dtype=np.int16)
+    color = np.empty(n, dtype=np.int8)
+    needs = np.empty(n, dtype=np.bool_)
+
+    kernel = _numba_classify() if n >= NUMBA_MIN_ROWS else None
+    (kernel or _classify_numpy)(days, np.ascontiguousarray(known, dtype=np.bool_),
+                                int(max_reminder), int(threshold), status, priority, color, needs)
+    return status, priority, color, needs
@@ -4,13 +4,53 @@
 负责YAML配置文件的加载、验证和管理。
 """
 
+import copy
 import os
+import pickle
+import sys
 import yaml
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from importlib import resources
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+# 优先使用libyaml实现的C版本加载器/输出器，不可用时退回纯Python实现
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 
-@dataclass
+class _TemplateDumper(_YamlDumper):
+    """生成配置模板用的输出器：多行字符串（HTML模板）以 | 块格式原样输出"""
+
+
+def _represent_str(dumper: yaml.BaseDumper, value: str) -> yaml.ScalarNode:
+    """字符串含换行时使用块格式，其余按默认格式输出"""
+    return dumper.represent_scalar('tag:yaml.org,2002:str', value, style='|' if '\n' in value else None)
+
+
+_TemplateDumper.add_representer(str, _represent_str)
+
+# SMTP服务器配置的必需字段
+_SMTP_REQUIRED_FIELDS = ('smtp_server', 'smtp_port', 'smtp_user', 'smtp_password', 'sender_name')
+
+
+@lru_cache(maxsize=None)
+def _read_template(name: str) -> str:
+    """
+    读取包内 templates 目录下的默认邮件模板（首次使用时加载并缓存）
+
+    Args:
+        name: 模板文件名
+
+    Returns:
+        模板内容
+    """
+    return resources.files('licence_management').joinpath('templates').joinpath(name).read_text(encoding='utf-8').rstrip('\n')
+
+
+@dataclass(slots=True)
 class SmtpServerConfig:
     """单个SMTP服务器配置类"""
     name: str
@@ -23,29 +63,31 @@ class SmtpServerConfig:
     use_tls: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailConfig:
     """邮件配置类"""
     primary_server: SmtpServerConfig
     backup_servers: List[SmtpServerConfig]
     receiver_email: str
     max_retry_attempts: int = 3
+    # 启动时是否在后台预先建立主服务器连接
+    warmup_connection: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ReminderConfig:
     """提醒规则配置类"""
     days_before_expiry: List[int] = field(default_factory=lambda: [60, 30, 7, 1])
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportConfig:
     """报告配置类"""
     output_filename: str = "证件状态报告_{date}.csv"
     days_until_expiring_threshold: int = 30
 
 
-@dataclass
+@dataclass(slots=True)
 class MailTemplateConfig:
     """邮件模板配置类"""
     subject: str = "证件到期提醒 - {count}个证件需要关注 ({today_date})"
@@ -53,7 +95,7 @@ class MailTemplateConfig:
     table_row_html: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     """应用主配置类"""
     email: EmailConfig
@@ -69,9 +111,69 @@ class AppConfig:
     log_file: Optional[str] = None
 
 
+# 配置数据类的字段结构，随pickle缓存一起保存；字段增减后旧缓存自动失效
+_CONFIG_SCHEMA = tuple(
+    (cls.__name__, cls.__slots__)
+    for cls in (SmtpServerConfig, EmailConfig, ReminderConfig, ReportConfig, MailTemplateConfig, AppConfig)
+)
+
+
+def _intern_text(value: Any) -> Any:
+    """驻留字符串配置值（非字符串原样返回）"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _is_private_file(st: os.stat_result) -> bool:
+    """
+    判断文件是否只有当前用户可以访问（非POSIX系统无法检查，视为是）
+    
+    Args:
+        st: 文件的stat结果
+        
+    Returns:
+        文件属于当前用户且组和其他用户没有任何权限时返回True
+    """
+    if not hasattr(os, 'getuid'):
+        return True
+    return st.st_uid == os.getuid() and st.st_mode & 0o077 == 0
+
+
+@lru_cache(maxsize=32)
+def _smtp_server_config_from_items(items: Tuple[Tuple[str, Any], ...], server_name_hint: str) -> SmtpServerConfig:
+    """
+    根据服务器配置项构建SMTP服务器配置（按配置内容缓存）
+
+    Args:
+        items: 服务器配置数据的键值对
+        server_name_hint: 服务器名称提示（用于默认名称和错误信息）
+
+    Returns:
+        SMTP服务器配置对象
+
+    Raises:
+        ValueError: 缺少必需字段
+    """
+    server_data = dict(items)
+    try:
+        # 字符串字段驻留，多个服务器重复的发件人名称、账号等共享同一对象
+        return SmtpServerConfig(
+            name=_intern_text(server_data.get('name', server_name_hint)),
+            **{key: _intern_text(server_data[key]) for key in _SMTP_REQUIRED_FIELDS},
+            use_ssl=server_data.get('use_ssl', True),
+            use_tls=server_data.get('use_tls', False)
+        )
+    except KeyError as e:
+        raise ValueError(f"{server_name_hint}配置缺少字段: {e.args[0]}") from None
+
+
 class ConfigManager:
     """配置管理器"""
     
+    # 已解析配置及其验证结果的LRU缓存，键为 (绝对路径, 修改时间纳秒, 文件大小)，所有实例共享
+    # 缓存中保存独立的副本，命中时返回新的副本，各实例修改自己的配置不会相互影响
+    _CACHE: "OrderedDict[Tuple[str, int, int], Tuple[AppConfig, List[str]]]" = OrderedDict()
+    _CACHE_SIZE = 32
+    
     def __init__(self, config_file: str = "config.yaml"):
         """
         初始化配置管理器
@@ -81,6 +183,10 @@ class ConfigManager:
         """
         self.config_file = config_file
         self._config: Optional[AppConfig] = None
+        # 已加载配置文件的 (修改时间纳秒, 文件大小)
+        self._stamp: Optional[Tuple[int, int]] = None
+        # 最近一次验证结果：(验证时配置文件的 (修改时间纳秒, 文件大小), 验证错误列表)
+        self._validation: Optional[Tuple[Tuple[int, int], List[str]]] = None
     
     def load_config(self) -> AppConfig:
         """
@@ -97,13 +203,98 @@ class ConfigManager:
         if not os.path.exists(self.config_file):
             raise FileNotFoundError(f"配置文件不存在: {self.config_file}")
         
-        with open(self.config_file, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        # 文件未修改时直接返回缓存中已解析的配置
+        st = os.stat(self.config_file)
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = (os.path.abspath(self.config_file), *stamp)
+        self._stamp = stamp
+        cache = ConfigManager._CACHE
+        if key in cache:
+            cache.move_to_end(key)
+            config, errors = cache[key]
+            self._config = copy.deepcopy(config)
+            self._validation = (stamp, errors)
+            return self._config
+        
+        # 优先使用与当前YAML文件对应的pickle缓存，跳过解析和验证
+        cached = self._load_pickle_cache(stamp)
+        if cached is not None:
+            self._config, errors = cached
+        else:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config_data = yaml.load(f, Loader=_YamlLoader)
+            
+            # 验证和构建配置对象，验证结果与配置一起缓存，配置文件未变化时无需重复验证
+            self._config = self._build_config(config_data)
+            errors = self._validate(self._config)
+            self._write_pickle_cache(stamp, self._config, errors)
         
-        # 验证和构建配置对象
-        self._config = self._build_config(config_data)
+        self._validation = (stamp, errors)
+        cache[key] = (copy.deepcopy(self._config), errors)
+        if len(cache) > ConfigManager._CACHE_SIZE:
+            cache.popitem(last=False)
         return self._config
     
+    @property
+    def _pickle_cache_file(self) -> str:
+        """配置文件旁的pickle缓存文件路径"""
+        return self.config_file + ".pkl"
+    
+    def _load_pickle_cache(self, config_stamp: Tuple[int, int]) -> Optional[Tuple[AppConfig, List[str]]]:
+        """
+        读取pickle缓存的配置对象及其验证结果
+        
+        缓存中记录了生成时YAML文件的 (修改时间纳秒, 文件大小)，必须与当前文件完全一致才使用，
+        恢复旧版本配置文件（修改时间变早）时同样能识别出缓存已过期。
+        反序列化pickle可执行任意代码，因此在POSIX系统上只读取属于当前用户、
+        且其他用户无读写权限的缓存文件，否则忽略缓存重新解析YAML。
+        
+        Args:
+            config_stamp: YAML配置文件当前的 (修改时间纳秒, 文件大小)
+            
+        Returns:
+            (配置对象, 验证错误列表)，缓存不存在、已过期或无法读取时返回None
+        """
+        try:
+            with open(self._pickle_cache_file, 'rb') as f:
+                if not _is_private_file(os.fstat(f.fileno())):
+                    return None
+                schema, stamp, config, errors = pickle.load(f)
+        except Exception:
+            # 缓存只是加速手段，任何读取问题都退回到解析YAML
+            return None
+        if (schema != _CONFIG_SCHEMA or stamp != config_stamp
+                or not isinstance(config, AppConfig) or not isinstance(errors, list)):
+            return None
+        return config, errors
+    
+    def _write_pickle_cache(self, config_stamp: Tuple[int, int], config: AppConfig, errors: List[str]) -> None:
+        """
+        将配置对象及其验证结果写入pickle缓存（先写临时文件再替换，避免读到写了一半的缓存）
+        
+        Args:
+            config_stamp: 读取时YAML配置文件的 (修改时间纳秒, 文件大小)
+            config: 应用配置对象
+            errors: 配置的验证错误列表
+        """
+        tmp_file = f"{self._pickle_cache_file}.{os.getpid()}.tmp"
+        try:
+            # 缓存中含有SMTP密码，只允许当前用户读写（不受umask默认权限影响）
+            try:
+                os.remove(tmp_file)
+            except FileNotFoundError:
+                pass
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((_CONFIG_SCHEMA, config_stamp, config, errors), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self._pickle_cache_file)
+        except OSError:
+            # 配置目录不可写时不影响正常加载
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+    
     def _build_config(self, config_data: Dict[str, Any]) -> AppConfig:
         """
         从字典数据构建配置对象
@@ -197,7 +388,8 @@ class ConfigManager:
             primary_server=primary_server,
             backup_servers=backup_servers,
             receiver_email=email_data['receiver_email'],
-            max_retry_attempts=email_data.get('max_retry_attempts', 3)
+            max_retry_attempts=email_data.get('max_retry_attempts', 3),
+            warmup_connection=bool(email_data.get('warmup_connection', False))
         )
 
     def _build_email_config_legacy(self, email_data: Dict[str, Any]) -> EmailConfig:
@@ -208,13 +400,17 @@ class ConfigManager:
         """
         import warnings
 
-        # 验证旧格式的必需字段
-        required_fields = ['smtp_server', 'smtp_port', 'smtp_user', 'smtp_password',
-                          'sender_name', 'receiver_email']
-
-        for field in required_fields:
-            if field not in email_data:
-                raise ValueError(f"邮件配置缺少字段: {field}")
+        # 将旧格式转换为主服务器配置（缺少必需字段时由 KeyError 转为 ValueError）
+        try:
+            primary_server = SmtpServerConfig(
+                name="默认服务器（旧格式转换）",
+                **{key: email_data[key] for key in _SMTP_REQUIRED_FIELDS},
+                use_ssl=email_data.get('use_ssl', True),
+                use_tls=email_data.get('use_tls', False)
+            )
+            receiver_email = email_data['receiver_email']
+        except KeyError as e:
+            raise ValueError(f"邮件配置缺少字段: {e.args[0]}") from None
 
         # 打印警告信息
         warnings.warn(
@@ -225,23 +421,12 @@ class ConfigManager:
             stacklevel=2
         )
 
-        # 将旧格式转换为主服务器配置
-        primary_server = SmtpServerConfig(
-            name="默认服务器（旧格式转换）",
-            smtp_server=email_data['smtp_server'],
-            smtp_port=email_data['smtp_port'],
-            smtp_user=email_data['smtp_user'],
-            smtp_password=email_data['smtp_password'],
-            sender_name=email_data['sender_name'],
-            use_ssl=email_data.get('use_ssl', True),
-            use_tls=email_data.get('use_tls', False)
-        )
-
         return EmailConfig(
             primary_server=primary_server,
             backup_servers=[],
-            receiver_email=email_data['receiver_email'],
-            max_retry_attempts=email_data.get('max_retry_attempts', 3)
+            receiver_email=receiver_email,
+            max_retry_attempts=email_data.get('max_retry_attempts', 3),
+            warmup_connection=bool(email_data.get('warmup_connection', False))
         )
 
     def _build_smtp_server_config(self, server_data: Dict[str, Any], server_name_hint: str) -> SmtpServerConfig:
@@ -255,23 +440,14 @@ class ConfigManager:
         Returns:
             SMTP服务器配置对象
         """
-        # 验证必需字段
-        required_fields = ['smtp_server', 'smtp_port', 'smtp_user', 'smtp_password', 'sender_name']
-
-        for field in required_fields:
-            if field not in server_data:
-                raise ValueError(f"{server_name_hint}配置缺少字段: {field}")
-
-        return SmtpServerConfig(
-            name=server_data.get('name', server_name_hint),
-            smtp_server=server_data['smtp_server'],
-            smtp_port=server_data['smtp_port'],
-            smtp_user=server_data['smtp_user'],
-            smtp_password=server_data['smtp_password'],
-            sender_name=server_data['sender_name'],
-            use_ssl=server_data.get('use_ssl', True),
-            use_tls=server_data.get('use_tls', False)
-        )
+        # 相同的服务器配置只构建一次（配置值不可哈希时直接构建）
+        try:
+            items = tuple(sorted(server_data.items()))
+            hash(items)
+        except TypeError:
+            return _smtp_server_config_from_items.__wrapped__(tuple(server_data.items()), server_name_hint)
+        # 返回缓存对象的副本（字段均为不可变值，浅复制即可），各配置修改互不影响
+        return copy.copy(_smtp_server_config_from_items(items, server_name_hint))
     
     def _build_reminder_config(self, reminder_data: Dict[str, Any]) -> ReminderConfig:
         """构建提醒配置"""
@@ -291,10 +467,11 @@ class ConfigManager:
     
     def _build_template_config(self, template_data: Dict[str, Any]) -> MailTemplateConfig:
         """构建邮件模板配置"""
+        # 模板字符串在每封邮件中反复使用，驻留后相同模板共享同一对象
         return MailTemplateConfig(
-            subject=template_data.get('subject', "证件到期提醒 - {count}个证件需要关注 ({today_date})"),
-            body_html=template_data.get('body_html', ""),
-            table_row_html=template_data.get('table_row_html', "")
+            subject=_intern_text(template_data.get('subject', "证件到期提醒 - {count}个证件需要关注 ({today_date})")),
+            body_html=_intern_text(template_data.get('body_html', "")),
+            table_row_html=_intern_text(template_data.get('table_row_html', ""))
         )
     
     @property
@@ -312,20 +489,45 @@ class ConfigManager:
             raise RuntimeError("配置尚未加载，请先调用load_config()")
         return self._config
     
-    def validate_config(self) -> List[str]:
+    def validate_config(self, force: bool = False) -> List[str]:
         """
         验证配置的有效性
         
+        加载时已随配置一起验证，配置文件未变化时直接返回该结果；
+        加载后在内存中修改了配置时需传入force=True重新验证。
+        
+        Args:
+            force: 是否忽略已缓存的验证结果，重新验证
+            
         Returns:
             验证错误列表，空列表表示验证通过
         """
         if self._config is None:
             return ["配置尚未加载"]
         
+        # 验证结果对应的仍是当前加载的配置文件时直接使用
+        if not force and self._validation is not None and self._validation[0] == self._stamp:
+            return list(self._validation[1])
+        
+        errors = self._validate(self._config)
+        self._validation = (self._stamp, errors)
+        return list(errors)
+    
+    @staticmethod
+    def _validate(config: AppConfig) -> List[str]:
+        """
+        逐项验证配置
+        
+        Args:
+            config: 应用配置对象
+            
+        Returns:
+            验证错误列表，空列表表示验证通过
+        """
         errors = []
         
         # 验证邮件配置
-        email_config = self._config.email
+        email_config = config.email
 
         # 验证主服务器配置
         if not email_config.primary_server.smtp_server:
@@ -358,7 +560,7 @@ class ConfigManager:
             errors.append("收件人邮箱不能为空")
         
         # 验证提醒配置
-        reminder_config = self._config.reminder
+        reminder_config = config.reminder
         if not reminder_config.days_before_expiry:
             errors.append("提醒天数列表不能为空")
         
@@ -366,7 +568,7 @@ class ConfigManager:
             errors.append("提醒天数不能为负数")
         
         # 验证报告配置
-        report_config = self._config.report
+        report_config = config.report
         if report_config.days_until_expiring_threshold < 0:
             errors.append("即将过期阈值不能为负数")
         
@@ -404,7 +606,8 @@ class ConfigManager:
                     }
                 ],
                 'receiver_email': 'recipient@example.com',
-                'max_retry_attempts': 3
+                'max_retry_attempts': 3,
+                'warmup_connection': False
             },
             'reminder': {
                 'days_before_expiry': [60, 30, 7, 1]
@@ -415,36 +618,8 @@ class ConfigManager:
             },
             'mail_template': {
                 'subject': '证件到期提醒 - {count}个证件需要关注 ({today_date})',
-                'body_html': '''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>证件到期提醒</title>
-</head>
-<body>
-    <h2>证件到期提醒</h2>
-    <p>以下证件即将到期或已过期，请及时处理：</p>
-    <table border="1" style="border-collapse: collapse; width: 100%;">
-        <tr style="background-color: #f2f2f2;">
-            <th>姓名</th>
-            <th>证件类型</th>
-            <th>到期日期</th>
-            <th>剩余天数</th>
-            <th>备注</th>
-        </tr>
-        {table_rows}
-    </table>
-    <br>
-    <p>此邮件由系统自动发送，请勿回复。</p>
-</body>
-</html>''',
-                'table_row_html': '''<tr>
-            <td>{person_name}</td>
-            <td>{document_type}</td>
-            <td>{expiry_date}</td>
-            <td style="color: {color};">{days_left}</td>
-            <td>{remarks}</td>
-        </tr>'''
+                'body_html': _read_template('default_body.html'),
+                'table_row_html': _read_template('default_row.html')
             },
             'data_file': 'sample_data/人员证件信息.csv',
             'log_level': 'INFO',
@@ -452,4 +627,5 @@ class ConfigManager:
         }
         
         with open(output_file, 'w', encoding='utf-8') as f:
-            yaml.dump(default_config, f, allow_unicode=True, default_flow_style=False, indent=2) 
\ No newline at end of file
+            yaml.dump(default_config, f, Dumper=_TemplateDumper, allow_unicode=True,
+                      default_flow_style=False, indent=2, sort_keys=False) 
\ No newline at end of file
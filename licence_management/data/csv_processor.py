@@ -4,31 +4,89 @@ CSV数据处理模块
 负责读取、验证和处理CSV格式的人员证件数据。
 """
 
-import pandas as pd
+import codecs
+import csv
+import numpy as np
 import os
+import sys
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import date
+from operator import attrgetter
 
 from ..utils.date_utils import DateUtils
 from ..utils.logger import get_logger
 
 
-@dataclass
+# 探测文件编码时读取的字节数
+_ENCODING_SNIFF_BYTES = 64 * 1024
+
+# 小于该大小的CSV文件使用标准库csv模块读取
+_SMALL_CSV_BYTES = 1_000_000
+
+# 少于该行数的证件列表直接使用标准库csv模块写出
+_SMALL_CSV_ROWS = 10_000
+
+# 视为空值的单元格内容（与pandas默认的空值标记一致）
+_NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+# 写出CSV时读取的证件字段
+_BASIC_FIELDS = attrgetter('person_name', 'document_type', 'remarks')
+_CALCULATED_FIELDS = attrgetter('days_left', 'status', 'needs_reminder')
+
+# 验证证件时读取的字段
+_VALIDATION_FIELDS = attrgetter('person_name', 'document_type', 'expiry_date', 'start_date')
+
+# 是否需要提醒在CSV中的显示文本
+_NEEDS_REMINDER_TEXT = {True: '是', False: '否', None: ''}
+
+# 按列读取的数据：列名 -> 该列各行的取值（空值为None）
+_Columns = Dict[str, List[Optional[str]]]
+
+
+def _row_count(columns: _Columns) -> int:
+    """按列读取的数据的行数"""
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+@dataclass(slots=True)
 class PersonDocument:
     """人员证件信息数据类"""
     person_name: str        # 姓名
     document_type: str      # 证件类型
     start_date: Optional[date] = None     # 有效期起始日期
     expiry_date: Optional[date] = None    # 有效期截止日期  
-    remarks: str = ""       # 备注信息
+    remarks: str = ""       # 备注信息（CSV读取时已去除首尾空白）
+    
+    # 分类编码（CSV读取时分配，用于按人员、证件类型分组）
+    person_code: Optional[int] = None       # 姓名编码
+    doc_type_code: Optional[int] = None     # 证件类型编码
     
     # 计算字段
     days_left: Optional[int] = None         # 剩余天数（计算得出）
     status: Optional[str] = None            # 状态（计算得出）
+    status_rank: Optional[int] = None       # 状态排序等级：0=已过期，1=即将过期，2=其他（计算得出）
+    display_color: Optional[str] = None     # 显示颜色（计算得出）
     needs_reminder: Optional[bool] = None   # 是否需要提醒（计算得出）
 
 
+@dataclass(slots=True)
+class DocumentFrame:
+    """证件列式数据：读取得到的证件列表及与其按行一一对应的到期日期数组"""
+    documents: List[PersonDocument]     # 对应的证件列表（只有同一列表才能使用本列式数据）
+    expiry_date: np.ndarray             # 到期日期（datetime64[D]，缺失为NaT）
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def matches(self, documents: List[PersonDocument]) -> bool:
+        """是否为该证件列表的列式数据（同一列表对象且未增删）"""
+        return documents is self.documents and len(self.expiry_date) == len(documents)
+
+
 class CSVProcessor:
     """CSV数据处理器"""
     
@@ -49,6 +107,11 @@ class CSVProcessor:
             logger: 日志记录器，如果为None则创建默认记录器
         """
         self.logger = logger or get_logger(__name__)
+        # 最近一次读取得到的列式数据
+        self.frame: Optional[DocumentFrame] = None
+        # 姓名、证件类型的字典编码（同一处理器多次读取得到的证件编码一致）
+        self.name_to_code: Dict[str, int] = {}
+        self.type_to_code: Dict[str, int] = {}
     
     def read_csv_file(self, file_path: str, encoding: str = 'utf-8') -> List[PersonDocument]:
         """
@@ -71,125 +134,258 @@ class CSVProcessor:
         
         self.logger.info(f"开始读取CSV文件: {file_path}")
         
-        # 尝试不同编码读取文件
-        encodings_to_try = [encoding, 'utf-8', 'gbk', 'gb2312']
-        df = None
+        # 先根据文件开头探测编码，探测到的编码排在最前，避免整文件反复读取失败
+        encodings_to_try = list(dict.fromkeys([encoding, 'utf-8', 'gbk', 'gb2312']))
+        detected = self._detect_encoding(file_path, encodings_to_try)
+        if detected:
+            encodings_to_try = list(dict.fromkeys([detected] + encodings_to_try))
+        # 只读取表头检查必需列，缺列的文件无需完整解析
+        self._check_header(file_path, encodings_to_try[0])
+        
+        columns = None
         used_encoding = None
         
+        # 小文件直接用标准库csv模块读取，省去构建DataFrame的开销
+        read_columns = (self._read_columns_stdlib if os.path.getsize(file_path) < _SMALL_CSV_BYTES
+                        else self._read_columns_pandas)
+        
         for enc in encodings_to_try:
             try:
-                df = pd.read_csv(file_path, encoding=enc)
+                columns = read_columns(file_path, enc)
                 used_encoding = enc
                 self.logger.info(f"成功使用编码 {enc} 读取文件")
                 break
             except UnicodeDecodeError:
                 continue
         
-        if df is None:
+        if columns is None:
             raise UnicodeDecodeError(f"无法使用任何编码读取文件: {file_path}")
         
-        # 验证数据格式
-        self._validate_dataframe(df, file_path)
-        
-        # 转换为PersonDocument对象列表
-        documents = self._dataframe_to_documents(df)
+        # 验证数据格式并转换为PersonDocument对象列表
+        documents = self._columns_to_documents(columns, file_path)
         
         self.logger.info(f"成功读取 {len(documents)} 条人员证件记录")
         return documents
     
-    def _validate_dataframe(self, df: pd.DataFrame, file_path: str) -> None:
+    def _read_columns_stdlib(self, file_path: str, encoding: str) -> _Columns:
+        """
+        使用标准库csv模块按列读取文件（与pandas读取方式的空值规则一致）
+
+        Args:
+            file_path: 文件路径
+            encoding: 文件编码
+
+        Returns:
+            支持的列名到该列取值列表的映射，空值为None
         """
-        验证DataFrame的格式和内容
+        with open(file_path, 'r', encoding=encoding, newline='') as f:
+            reader = csv.reader(f)
+            # 跳过开头的空行，第一个非空行为表头（与pandas一致）
+            header = next((row for row in reader if row), [])
+            # 表头中重复的列只取第一次出现的位置（与pandas一致）
+            first_positions: Dict[str, int] = {}
+            for i, col in enumerate(header):
+                if col in self.ALL_COLUMNS:
+                    first_positions.setdefault(col, i)
+            positions = list(first_positions.items())
+            columns: _Columns = {col: [] for col, _ in positions}
+
+            for row in reader:
+                if not row:  # 与pandas一致，跳过空行
+                    continue
+                width = len(row)
+                for col, i in positions:
+                    value = row[i] if i < width else None
+                    columns[col].append(None if value in _NA_VALUES else value)
+
+        return columns
+
+    def _read_columns_pandas(self, file_path: str, encoding: str) -> _Columns:
+        """
+        使用pandas按列读取文件
 
         Args:
-            df: 要验证的DataFrame
+            file_path: 文件路径
+            encoding: 文件编码
+
+        Returns:
+            支持的列名到该列取值列表的映射，空值为None
+        """
+        # pandas导入较慢，只在读取大文件时才导入
+        import pandas as pd
+        
+        # 只读取支持的列并全部按字符串读取，跳过类型推断；
+        # 日期格式多样（含DD/MM/YYYY等），仍由DateUtils统一解析
+        df = pd.read_csv(file_path, encoding=encoding, engine='c', dtype=str,
+                         usecols=lambda col: col in self.ALL_COLUMNS)
+        return {col: df[col].astype(object).where(df[col].notna(), None).tolist()
+                for col in df.columns}
+
+    def _check_header(self, file_path: str, encoding: str) -> None:
+        """
+        读取CSV表头并检查必需列是否存在
+
+        表头无法解码或文件为空时不做检查，留给完整读取时处理。
+
+        Args:
+            file_path: 文件路径
+            encoding: 文件编码
+
+        Raises:
+            ValueError: 缺少必需列
+        """
+        try:
+            with open(file_path, 'r', encoding=encoding, newline='') as f:
+                header = next((row for row in csv.reader(f) if row), None)
+        except UnicodeDecodeError:
+            return
+
+        if not header:
+            return
+
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in header]
+        if missing_columns:
+            raise ValueError(f"CSV文件缺少必需列: {missing_columns}, 文件: {file_path}")
+
+    def _detect_encoding(self, file_path: str, candidates: List[str]) -> Optional[str]:
+        """
+        根据文件开头（64KB）探测文件编码
+
+        带UTF-8 BOM的文件使用 utf-8-sig，否则返回第一个能解码文件开头的候选编码。
+
+        Args:
+            file_path: 文件路径
+            candidates: 候选编码列表（按优先级排列）
+
+        Returns:
+            探测到的编码，均无法解码时返回None
+        """
+        with open(file_path, 'rb') as f:
+            head = f.read(_ENCODING_SNIFF_BYTES)
+
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+
+        for enc in candidates:
+            try:
+                # 使用增量解码器，容忍末尾被截断的多字节字符
+                codecs.getincrementaldecoder(enc)().decode(head, final=False)
+                return enc
+            except (UnicodeDecodeError, LookupError):
+                continue
+        return None
+
+    def _parse_date_column(self, columns: _Columns, column: str) -> Tuple[List[str], List[Optional[date]]]:
+        """
+        解析日期列
+
+        相同的日期字符串只调用一次 DateUtils.parse_date。
+
+        Args:
+            columns: 按列读取的数据
+            column: 日期列名
+
+        Returns:
+            (去除首尾空白后的日期字符串列表, 解析结果列表)，空值对应空字符串和None；
+            列不存在时全部为空
+        """
+        if column not in columns:
+            row_count = _row_count(columns)
+            return [''] * row_count, [None] * row_count
+
+        texts = [value.strip() if value is not None else '' for value in columns[column]]
+        parsed = {text: DateUtils.parse_date(text) for text in set(texts)}
+        return texts, [parsed[text] for text in texts]
+
+    def _columns_to_documents(self, columns: _Columns, file_path: str) -> List[PersonDocument]:
+        """
+        验证按列读取的数据并转换为PersonDocument对象列表
+
+        验证与转换在同一次遍历中完成：必需字段为空时立即报错，
+        到期日期无效的记录记录警告后跳过。
+
+        Args:
+            columns: 按列读取的数据
             file_path: 文件路径（用于错误提示）
 
+        Returns:
+            PersonDocument对象列表
+
         Raises:
             ValueError: 数据格式错误
         """
         # 检查是否为空
-        if df.empty:
+        row_count = _row_count(columns)
+        if row_count == 0:
             raise ValueError(f"CSV文件为空: {file_path}")
 
         # 检查必需列是否存在
-        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in columns]
         if missing_columns:
             raise ValueError(f"CSV文件缺少必需列: {missing_columns}, 文件: {file_path}")
 
-        # 检查数据完整性
+        # 日期列整体解析，每个不同的日期字符串只解析一次
+        start_text, start_dates = self._parse_date_column(columns, 'start_date')
+        expiry_text, expiry_dates = self._parse_date_column(columns, 'expiry_date')
+        remarks_column = columns.get('remarks') or [None] * row_count
+
+        documents = []
         invalid_dates_count = 0
-        for idx, row in df.iterrows():
+        name_to_code = self.name_to_code
+        type_to_code = self.type_to_code
+
+        for idx, (person_name, document_type, expiry_raw, remark) in enumerate(
+                zip(columns['person_name'], columns['document_type'], columns['expiry_date'], remarks_column)):
             # 检查必需字段是否为空
-            for col in self.REQUIRED_COLUMNS:
-                if pd.isna(row[col]) or str(row[col]).strip() == '':
+            for col, value in zip(self.REQUIRED_COLUMNS, (person_name, document_type, expiry_raw)):
+                if value is None or not value.strip():
                     raise ValueError(f"第{idx+2}行的'{col}'字段不能为空")
 
-            # 验证日期格式
-            if 'expiry_date' in row and not pd.isna(row['expiry_date']):
-                expiry_str = str(row['expiry_date']).strip()
-                if not DateUtils.is_valid_date(expiry_str):
-                    # 记录警告但不中断处理
-                    self.logger.warning(f"第{idx+2}行的到期日期格式无效: {expiry_str}，该记录将被跳过")
-                    invalid_dates_count += 1
+            if start_text[idx] and start_dates[idx] is None:
+                self.logger.warning(f"第{idx+2}行的开始日期格式无效: {start_text[idx]}")
+
+            # 如果到期日期无效，记录警告并跳过该记录
+            expiry_date = expiry_dates[idx]
+            if expiry_date is None:
+                self.logger.warning(f"第{idx+2}行的到期日期格式无效: {expiry_text[idx]}，该记录将被跳过")
+                invalid_dates_count += 1
+                continue
 
-            if 'start_date' in row and not pd.isna(row['start_date']):
-                start_str = str(row['start_date']).strip()
-                if start_str and not DateUtils.is_valid_date(start_str):
-                    self.logger.warning(f"第{idx+2}行的开始日期格式无效: {start_str}")
+            person_name = person_name.strip()
+            document_type = document_type.strip()
+            documents.append(PersonDocument(
+                person_name=person_name,
+                document_type=document_type,
+                start_date=start_dates[idx],
+                expiry_date=expiry_date,
+                remarks=sys.intern(remark.strip()) if remark is not None else '',
+                person_code=name_to_code.setdefault(person_name, len(name_to_code)),
+                doc_type_code=type_to_code.setdefault(document_type, len(type_to_code))
+            ))
 
         if invalid_dates_count > 0:
             self.logger.warning(f"发现 {invalid_dates_count} 条记录的日期格式无效，请检查数据文件")
 
-        self.logger.info(f"CSV数据验证通过，共 {len(df)} 行数据")
-    
-    def _dataframe_to_documents(self, df: pd.DataFrame) -> List[PersonDocument]:
+        self.logger.info(f"CSV数据验证通过，共 {row_count} 行数据")
+
+        self.frame = self._build_frame(documents)
+        return documents
+
+    def _build_frame(self, documents: List[PersonDocument]) -> DocumentFrame:
         """
-        将DataFrame转换为PersonDocument对象列表
+        根据证件列表构建列式数据（只构建状态计算用到的到期日期列）
 
         Args:
-            df: 要转换的DataFrame
+            documents: PersonDocument对象列表
 
         Returns:
-            PersonDocument对象列表
+            列式数据
         """
-        documents = []
-
-        for idx, row in df.iterrows():
-            try:
-                # 解析日期
-                start_date = None
-                expiry_date = None
-
-                if 'start_date' in row and not pd.isna(row['start_date']):
-                    start_str = str(row['start_date']).strip()
-                    if start_str:  # 非空字符串才解析
-                        start_date = DateUtils.parse_date(start_str)
-
-                if 'expiry_date' in row and not pd.isna(row['expiry_date']):
-                    expiry_str = str(row['expiry_date']).strip()
-                    expiry_date = DateUtils.parse_date(expiry_str)
-                    # 如果到期日期无效，跳过该记录
-                    if expiry_date is None:
-                        self.logger.warning(f"第{idx+2}行：无法解析到期日期，跳过该记录")
-                        continue
-
-                # 创建PersonDocument对象
-                doc = PersonDocument(
-                    person_name=str(row['person_name']).strip(),
-                    document_type=str(row['document_type']).strip(),
-                    start_date=start_date,
-                    expiry_date=expiry_date,
-                    remarks=str(row.get('remarks', '')).strip() if not pd.isna(row.get('remarks', '')) else ""
-                )
-
-                documents.append(doc)
-
-            except Exception as e:
-                self.logger.error(f"处理第{idx+2}行数据时出错: {e}")
-                raise ValueError(f"处理第{idx+2}行数据时出错: {e}")
-
-        return documents
+        nat = np.datetime64('NaT')
+        return DocumentFrame(
+            documents=documents,
+            expiry_date=np.array([doc.expiry_date or nat for doc in documents], dtype='datetime64[D]')
+        )
     
     def write_csv_file(self, documents: List[PersonDocument], file_path: str, 
                       include_calculated_fields: bool = True, encoding: str = 'utf-8') -> None:
@@ -205,36 +401,41 @@ class CSVProcessor:
         if not documents:
             raise ValueError("没有数据可写入")
         
-        # 准备数据
-        data_rows = []
-        for doc in documents:
-            row = {
-                'person_name': doc.person_name,
-                'document_type': doc.document_type,
-                'start_date': DateUtils.format_date(doc.start_date) if doc.start_date else '',
-                'expiry_date': DateUtils.format_date(doc.expiry_date) if doc.expiry_date else '',
-                'remarks': doc.remarks
-            }
-            
-            # 添加计算字段
-            if include_calculated_fields:
-                row.update({
-                    'days_left': doc.days_left if doc.days_left is not None else '',
-                    'status': doc.status if doc.status else '',
-                    'needs_reminder': '是' if doc.needs_reminder else '否' if doc.needs_reminder is not None else ''
-                })
-            
-            data_rows.append(row)
+        # 按列构建数据，省去逐行创建字典；属性读取使用C实现的attrgetter
+        names, doc_types, remarks = zip(*map(_BASIC_FIELDS, documents))
+        data_columns = {
+            'person_name': names,
+            'document_type': doc_types,
+            'start_date': [DateUtils.format_date(doc.start_date) if doc.start_date else '' for doc in documents],
+            'expiry_date': [DateUtils.format_date(doc.expiry_date) if doc.expiry_date else '' for doc in documents],
+            'remarks': remarks
+        }
         
-        # 创建DataFrame并保存
-        df = pd.DataFrame(data_rows)
+        # 添加计算字段
+        if include_calculated_fields:
+            days_left, status, needs_reminder = zip(*map(_CALCULATED_FIELDS, documents))
+            data_columns.update({
+                'days_left': ['' if days is None else days for days in days_left],
+                'status': [text or '' for text in status],
+                'needs_reminder': list(map(_NEEDS_REMINDER_TEXT.__getitem__, needs_reminder))
+            })
         
         # 确保输出目录存在
         output_dir = os.path.dirname(file_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
         
-        df.to_csv(file_path, index=False, encoding=encoding)
+        if len(documents) < _SMALL_CSV_ROWS:
+            # 数据量不大时直接用csv模块逐行写出，无需构建DataFrame（换行符与pandas一致）
+            with open(file_path, 'w', encoding=encoding, newline='') as f:
+                writer = csv.writer(f, lineterminator=os.linesep)
+                writer.writerow(data_columns.keys())
+                writer.writerows(zip(*data_columns.values()))
+        else:
+            import pandas as pd
+            
+            # 创建DataFrame并保存
+            pd.DataFrame(data_columns).to_csv(file_path, index=False, encoding=encoding)
         self.logger.info(f"成功写入CSV文件: {file_path}, 共 {len(documents)} 条记录")
     
     def create_sample_csv(self, file_path: str = "sample_data/人员证件信息.csv") -> None:
@@ -245,6 +446,7 @@ class CSVProcessor:
             file_path: 输出文件路径
         """
         from datetime import datetime, timedelta
+        import pandas as pd
         
         # 准备示例数据
         today = date.today()
@@ -313,20 +515,25 @@ class CSVProcessor:
             errors.append("没有任何证件数据")
             return errors
         
-        for i, doc in enumerate(documents):
+        for i, (person_name, document_type, expiry_date, start_date) in enumerate(
+                map(_VALIDATION_FIELDS, documents), 1):
+            # 绝大多数记录有效，先整体判断一次，有问题时再逐项生成错误信息
+            if (person_name and person_name.strip() and document_type and document_type.strip()
+                    and expiry_date and not (start_date and start_date >= expiry_date)):
+                continue
+            
             # 验证必需字段
-            if not doc.person_name or not doc.person_name.strip():
-                errors.append(f"第{i+1}条记录：姓名不能为空")
+            if not person_name or not person_name.strip():
+                errors.append(f"第{i}条记录：姓名不能为空")
             
-            if not doc.document_type or not doc.document_type.strip():
-                errors.append(f"第{i+1}条记录：证件类型不能为空")
+            if not document_type or not document_type.strip():
+                errors.append(f"第{i}条记录：证件类型不能为空")
             
-            if not doc.expiry_date:
-                errors.append(f"第{i+1}条记录：到期日期不能为空")
+            if not expiry_date:
+                errors.append(f"第{i}条记录：到期日期不能为空")
             
             # 验证日期逻辑
-            if doc.start_date and doc.expiry_date:
-                if doc.start_date >= doc.expiry_date:
-                    errors.append(f"第{i+1}条记录：开始日期不能晚于或等于到期日期")
+            if start_date and expiry_date and start_date >= expiry_date:
+                errors.append(f"第{i}条记录：开始日期不能晚于或等于到期日期")
         
         return errors 
\ No newline at end of file
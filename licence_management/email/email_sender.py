@@ -4,12 +4,24 @@
 负责SMTP邮件发送和HTML模板渲染。
 """
 
+import asyncio
+import atexit
+import io
+import re
 import smtplib
+import socket
 import ssl
+import string
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import cached_property, lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
 from ..config.config_manager import EmailConfig, MailTemplateConfig, SmtpServerConfig
@@ -17,6 +29,365 @@ from ..data.csv_processor import PersonDocument
 from ..business.reminder_logic import ReminderLogic
 from ..utils.date_utils import DateUtils
 from ..utils.logger import get_logger
+from ..utils.template_utils import CompiledTemplate
+
+
+# 行首的点号（SMTP DATA阶段需要转义为两个点）
+_LEADING_DOT_RE = re.compile(br'(?m)^\.')
+
+
+class _MessagePayload:
+    """
+    待发送的邮件内容：From头 + 已序列化的邮件
+
+    按行边界切成小块依次写入套接字，不再拼接整封邮件、也不生成转义后的完整副本。
+    len() 返回总字节数，供sendmail声明SIZE参数。
+    """
+
+    def __init__(self, header: bytes, body: bytes, chunk_size: int = 64 * 1024):
+        """
+        Args:
+            header: 以CRLF结尾的邮件头（From头）
+            body: CRLF换行的已序列化邮件
+            chunk_size: 每块的大致字节数
+        """
+        self.header = header
+        self.body = body
+        self.chunk_size = chunk_size
+
+    def __len__(self) -> int:
+        return len(self.header) + len(self.body)
+
+    def __bytes__(self) -> bytes:
+        return self.header + self.body
+
+    def chunks(self):
+        """按行边界切分的内容块（每块都从行首开始，可以单独转义行首点号）"""
+        yield self.header
+        body = self.body
+        start, total = 0, len(body)
+        while start < total:
+            end = body.find(b'\n', start + self.chunk_size)
+            end = total if end < 0 else end + 1
+            yield body[start:end]
+            start = end
+
+
+class _NoDelaySMTP(smtplib.SMTP):
+    """
+    关闭Nagle算法的SMTP连接
+
+    SMTP命令都是短小的请求-应答，Nagle算法与服务器的延迟确认叠加会让每轮往返多等待数十毫秒。
+    发送 _MessagePayload 时分块写入套接字，内存中不再保留整封邮件的多个副本。
+    """
+
+    def _get_socket(self, host, port, timeout):
+        sock = super()._get_socket(host, port, timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def data(self, msg):
+        if not isinstance(msg, _MessagePayload):
+            return super().data(msg)
+
+        self.putcmd("data")
+        code, reply = self.getreply()
+        if code != 354:
+            raise smtplib.SMTPDataError(code, reply)
+
+        last = b''
+        for chunk in msg.chunks():
+            if chunk:
+                self.send(_LEADING_DOT_RE.sub(b'..', chunk))
+                last = chunk
+        self.send(b".\r\n" if last.endswith(b"\r\n") else b"\r\n.\r\n")
+        return self.getreply()
+
+
+class _NoDelaySMTP_SSL(smtplib.SMTP_SSL, _NoDelaySMTP):
+    """关闭Nagle算法的SMTP_SSL连接（在TLS握手之前设置）"""
+
+
+class _ConnectionPool:
+    """
+    SMTP长连接池
+
+    按服务器配置缓存已认证的连接，多次发送复用同一连接，省去重复的TCP/TLS握手和登录。
+    连接以借出/归还的方式使用：借出期间连接不在池中，不会同时交给多个发送方；
+    空闲超时或发送数量达到上限后自动更换，程序退出时统一关闭。
+    """
+
+    def __init__(self, max_connections: int = 4, idle_timeout: float = 120.0,
+                 max_messages_per_connection: int = 100):
+        """
+        初始化连接池
+
+        Args:
+            max_connections: 最多保留的空闲连接数
+            idle_timeout: 连接空闲超时时间（秒）
+            max_messages_per_connection: 单个连接最多发送的邮件数
+        """
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        # 空闲连接，按归还时间先后排列：[服务器键, 连接, 最后使用时间, 已发送数量]
+        self._idle: List[list] = []
+        # 已借出的连接：id(连接) -> [服务器键, 连接, 最后使用时间, 已发送数量]
+        self._in_use: Dict[int, list] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(server_config: SmtpServerConfig) -> Tuple:
+        """服务器配置对应的连接池键"""
+        return (server_config.smtp_server, server_config.smtp_port, server_config.smtp_user,
+                server_config.use_ssl, server_config.use_tls)
+
+    def acquire(self, server_config: SmtpServerConfig,
+                connect: Callable[[SmtpServerConfig], smtplib.SMTP]) -> smtplib.SMTP:
+        """
+        借出可用连接：优先复用仍然存活的空闲连接，否则调用connect新建
+
+        借出的连接使用完毕后必须调用 release 归还或 discard 丢弃。
+
+        Args:
+            server_config: SMTP服务器配置
+            connect: 建立并认证新连接的函数
+
+        Returns:
+            已认证的SMTP连接
+        """
+        key = self.key(server_config)
+        while True:
+            entry = self._take_idle(key)
+            if entry is None:
+                break
+            server, last_used, sent = entry[1:]
+            if time.monotonic() - last_used >= self.idle_timeout or sent >= self.max_messages_per_connection:
+                self._close(server)
+            elif self._is_alive(server):
+                with self._lock:
+                    self._in_use[id(server)] = entry
+                return server
+            else:
+                # 连接已失效，直接关闭套接字，不再等待QUIT应答
+                self._close(server, graceful=False)
+
+        server = connect(server_config)
+        with self._lock:
+            self._in_use[id(server)] = [key, server, time.monotonic(), 0]
+        return server
+
+    def _take_idle(self, key: Tuple) -> Optional[list]:
+        """取出指定服务器最近归还的空闲连接，没有时返回None"""
+        with self._lock:
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index][0] == key:
+                    return self._idle.pop(index)
+        return None
+
+    def release(self, server: smtplib.SMTP, sent: int = 1) -> None:
+        """
+        归还借出的连接
+
+        Args:
+            server: 借出的SMTP连接
+            sent: 本次借出期间发送的邮件数
+        """
+        evicted = []
+        with self._lock:
+            entry = self._in_use.pop(id(server), None)
+            if entry is not None:
+                entry[2] = time.monotonic()
+                entry[3] += sent
+                self._idle.append(entry)
+            while len(self._idle) > self.max_connections:
+                evicted.append(self._idle.pop(0)[1])
+        for old in evicted:
+            self._close(old)
+
+    def discard(self, server: smtplib.SMTP) -> None:
+        """
+        丢弃借出的连接（发送出错后调用，避免复用已失效的连接）
+
+        Args:
+            server: 借出的SMTP连接
+        """
+        with self._lock:
+            self._in_use.pop(id(server), None)
+        # 出错的连接直接关闭套接字，不再发送QUIT等待一次往返
+        self._close(server, graceful=False)
+
+    def close_idle(self, keys: Optional[Set[Tuple]] = None) -> None:
+        """
+        关闭空闲连接（已借出的连接不受影响，归还后仍可复用）
+
+        Args:
+            keys: 只关闭这些服务器的空闲连接，为None时关闭全部
+        """
+        with self._lock:
+            closing = [entry for entry in self._idle if keys is None or entry[0] in keys]
+            self._idle = [entry for entry in self._idle if keys is not None and entry[0] not in keys]
+        for entry in closing:
+            self._close(entry[1])
+
+    def close_all(self) -> None:
+        """关闭所有连接（程序退出时调用）"""
+        with self._lock:
+            entries = self._idle + list(self._in_use.values())
+            self._idle = []
+            self._in_use.clear()
+        for entry in entries:
+            self._close(entry[1])
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        """通过NOOP检查连接是否仍然可用"""
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(server: smtplib.SMTP, graceful: bool = True) -> None:
+        """
+        关闭连接，忽略关闭过程中的错误
+
+        Args:
+            server: SMTP连接
+            graceful: 是否先发送QUIT；连接出错时应为False，只在本地关闭套接字
+        """
+        if graceful:
+            try:
+                server.quit()
+                return
+            except Exception:
+                pass
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+@lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """所有连接共用的SSL上下文（首次使用时创建，只加载一次CA证书）"""
+    return ssl.create_default_context()
+
+
+# 邮箱地址格式：local@domain.tld，各部分不含空白和多余的@
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+
+# 剩余天数的固定显示文本（其余天数按是否过期格式化）
+_FIXED_DAYS_DISPLAY = {None: "未知", 0: "今天到期", 1: "明天到期"}
+
+
+@lru_cache(maxsize=1024)
+def _days_left_display(days_left: Optional[int]) -> str:
+    """剩余天数的显示文本（同一封邮件中相同天数很常见，按天数缓存）"""
+    fixed = _FIXED_DAYS_DISPLAY.get(days_left)
+    if fixed is not None:
+        return fixed
+    return f"已过期 {-days_left} 天" if days_left < 0 else f"{days_left} 天后到期"
+
+
+def _expiry_text(expiry_date: Any, format_date: Callable[..., str]) -> str:
+    """到期日期的显示文本（已是字符串时直接使用，无需再格式化）"""
+    if not expiry_date:
+        return '未知'
+    if isinstance(expiry_date, str):
+        return expiry_date
+    return format_date(expiry_date)
+
+
+# 测试邮件正文模板（内容固定，模块加载时编译一次）
+_TEST_BODY_TEMPLATE = CompiledTemplate("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>测试邮件</title>
+</head>
+<body>
+    <h2>证件管理系统测试邮件</h2>
+    <p>这是一封测试邮件，用于验证邮件配置是否正确。</p>
+    <p>如果您收到此邮件，说明邮件系统配置成功！</p>
+    <br>
+    <p><strong>发送时间：</strong>{send_time}</p>
+    <p><strong>系统信息：</strong>人员证件有效期管控系统</p>
+    <br>
+    <p>此邮件由系统自动发送，请勿回复。</p>
+</body>
+</html>
+""")
+
+
+def _smtp_vendor(smtp_server: str) -> str:
+    """根据SMTP服务器地址判断邮件服务商：gmail、qq、163 或 other"""
+    host = (smtp_server or '').lower()
+    for vendor in ('gmail', 'qq', '163'):
+        if f'{vendor}.com' in host:
+            return vendor
+    return 'other'
+
+
+# 各服务商认证失败时的解决建议
+_AUTH_ERROR_SUGGESTIONS = {
+    'gmail': (
+        "1. Gmail在国内可能无法访问，建议配置QQ邮箱等国内邮件服务作为备用服务器\n"
+        "   2. 请确认使用的是应用专用密码，而非Google账户密码\n"
+        "   3. 前往 Google账户设置 -> 安全性 -> 两步验证 -> 应用专用密码 生成密码"
+    ),
+    'qq': (
+        "1. 请确保已开启QQ邮箱SMTP服务\n"
+        "   2. 登录QQ邮箱 -> 设置 -> 账户 -> SMTP服务\n"
+        "   3. 使用授权码（而非登录密码）：\n"
+        "      登录QQ邮箱 -> 设置 -> 账户 -> 生成授权码"
+    ),
+    '163': (
+        "1. 请确保已开启163邮箱SMTP服务\n"
+        "   2. 使用授权码（而非登录密码）\n"
+        "   3. 检查是否因安全问题被暂时锁定"
+    ),
+    'other': "请检查用户名和密码/授权码是否正确",
+}
+
+# 连接失败时的解决建议
+_GMAIL_CONNECTION_SUGGESTION = (
+    "1. Gmail在国内无法直接访问，建议使用QQ邮箱等国内邮件服务\n"
+    "   2. 如果需要使用Gmail，请配置VPN或代理\n"
+    "   3. 建议在config.yaml中将QQ邮箱配置为primary_server"
+)
+_CONNECTION_SUGGESTION_TEMPLATE = (
+    "1. 请检查网络连接是否正常\n"
+    "   2. 检查防火墙设置\n"
+    "   3. 确认SMTP服务器地址和端口配置正确\n"
+    "   4. 当前配置端口: {port}"
+)
+
+# 所有服务器均失败后，各服务商的总结建议（{name} 为服务器名称）
+_FAILURE_SUMMARY_OTHER = (
+    "  问题: 连接或认证失败",
+    "  建议: 检查 {name} 的SMTP配置和网络连接",
+)
+_FAILURE_SUMMARY = {
+    'gmail': (
+        "  问题: Gmail在国内无法直接访问",
+        "  建议: 请配置QQ邮箱、163邮箱等国内邮件服务",
+    ),
+    'qq': (
+        "  问题: QQ邮箱认证失败或服务未开启",
+        "  建议: ",
+        "    1. 登录QQ邮箱 -> 设置 -> 账户 -> 开启SMTP服务",
+        "    2. 生成授权码（非登录密码）",
+        "    3. 在config.yaml中更新授权码",
+    ),
+}
+
+
+# 全局共享的SMTP连接池，程序退出时关闭所有连接
+_connection_pool = _ConnectionPool()
+atexit.register(_connection_pool.close_all)
 
 
 class EmailSender:
@@ -33,8 +404,41 @@ class EmailSender:
         """
         self.email_config = email_config
         self.template_config = template_config
-        self.logger = logger or get_logger(__name__)
-        self.reminder_logic = ReminderLogic(logger)
+        self._explicit_logger = logger
+        self._pool = _connection_pool
+        
+        # 邮件正文和表格行模板只编译一次
+        self._row_template = CompiledTemplate(template_config.table_row_html)
+        self._body_template = CompiledTemplate(template_config.body_html)
+        self._body_parts = self._split_body_template(template_config.body_html)
+
+        # 各服务器所属的邮件服务商只解析一次，出错时直接查表给出建议
+        self._vendors: Dict[Tuple, str] = {
+            _ConnectionPool.key(server): _smtp_vendor(server.smtp_server)
+            for server in [email_config.primary_server] + email_config.backup_servers
+        }
+
+        # 启动时在后台预热主服务器连接
+        self._warmup: Optional[Future] = None
+        # 同一发送器可能被多个线程同时使用（如异步发送），预热连接只能交给其中一次发送
+        self._warmup_lock = threading.Lock()
+        if email_config.warmup_connection:
+            self.warmup()
+
+        # 收件人列表只解析一次（支持多个收件人，逗号分隔）
+        self._receivers: Tuple[str, ...] = tuple(
+            sys.intern(email.strip()) for email in (email_config.receiver_email or '').split(',')
+        )
+    
+    @cached_property
+    def logger(self):
+        """日志记录器（首次使用时创建）"""
+        return self._explicit_logger or get_logger(__name__)
+    
+    @cached_property
+    def reminder_logic(self) -> ReminderLogic:
+        """提醒业务逻辑（首次生成邮件正文时创建）"""
+        return ReminderLogic(self._explicit_logger)
     
     def send_reminder_email(self, reminder_documents: List[PersonDocument]) -> bool:
         """
@@ -53,9 +457,10 @@ class EmailSender:
         self.logger.info(f"开始发送提醒邮件，包含 {len(reminder_documents)} 个证件")
         
         try:
-            # 生成邮件内容
-            subject = self._generate_subject(reminder_documents)
-            html_body = self._generate_html_body(reminder_documents)
+            # 生成邮件内容（主题和正文共用同一个当天日期，避免跨零点时不一致）
+            today_str = DateUtils.get_today_str('%Y-%m-%d')
+            subject = self._generate_subject(reminder_documents, today_str)
+            html_body = self._generate_html_body(reminder_documents, today_str)
             
             # 创建邮件对象（使用主服务器配置）
             message = self._create_email_message(
@@ -78,6 +483,22 @@ class EmailSender:
             self.logger.error(f"发送提醒邮件时发生错误: {e}")
             return False
     
+    async def send_reminder_email_async(self, reminder_documents: List[PersonDocument]) -> bool:
+        """
+        在异步环境中发送证件到期提醒邮件
+
+        SMTP发送是阻塞操作，放到线程池中执行，等待期间不阻塞事件循环。
+        多个发送可以同时进行：每次发送从连接池借出各自的连接，预热连接只交给其中一次发送。
+
+        Args:
+            reminder_documents: 需要提醒的证件文档列表
+
+        Returns:
+            是否发送成功
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.send_reminder_email, reminder_documents)
+    
     def send_test_email(self, test_subject: str = "证件管理系统 - 测试邮件") -> bool:
         """
         发送测试邮件（用于验证邮件配置）
@@ -92,25 +513,9 @@ class EmailSender:
         
         try:
             # 生成测试邮件内容
-            html_body = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>测试邮件</title>
-            </head>
-            <body>
-                <h2>证件管理系统测试邮件</h2>
-                <p>这是一封测试邮件，用于验证邮件配置是否正确。</p>
-                <p>如果您收到此邮件，说明邮件系统配置成功！</p>
-                <br>
-                <p><strong>发送时间：</strong>{send_time}</p>
-                <p><strong>系统信息：</strong>人员证件有效期管控系统</p>
-                <br>
-                <p>此邮件由系统自动发送，请勿回复。</p>
-            </body>
-            </html>
-            """.format(send_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            html_body = _TEST_BODY_TEMPLATE.render({
+                'send_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
             
             # 创建邮件对象（使用主服务器配置）
             message = self._create_email_message(
@@ -133,17 +538,19 @@ class EmailSender:
             self.logger.error(f"发送测试邮件时发生错误: {e}")
             return False
     
-    def _generate_subject(self, reminder_documents: List[PersonDocument]) -> str:
+    def _generate_subject(self, reminder_documents: List[PersonDocument],
+                          today_str: Optional[str] = None) -> str:
         """
         生成邮件主题
         
         Args:
             reminder_documents: 需要提醒的证件文档列表
+            today_str: 当天日期字符串（YYYY-MM-DD），为None时取当前日期
             
         Returns:
             邮件主题字符串
         """
-        today_date = DateUtils.get_today_str('%Y-%m-%d')
+        today_date = today_str or DateUtils.get_today_str('%Y-%m-%d')
         count = len(reminder_documents)
         
         subject = self.template_config.subject.format(
@@ -153,48 +560,78 @@ class EmailSender:
         
         return subject
     
-    def _generate_html_body(self, reminder_documents: List[PersonDocument]) -> str:
+    def _generate_html_body(self, reminder_documents: List[PersonDocument],
+                            today_str: Optional[str] = None) -> str:
         """
         生成HTML邮件正文
         
         Args:
             reminder_documents: 需要提醒的证件文档列表
+            today_str: 当天日期字符串（YYYY-MM-DD），为None时取当前日期
             
         Returns:
             HTML邮件正文字符串
         """
-        # 生成表格行
-        table_rows = []
-        for doc in reminder_documents:
-            # 获取显示颜色
-            color = self.reminder_logic.get_display_color(doc.days_left)
-            
-            # 格式化剩余天数显示
-            days_left_display = self._format_days_left_display(doc.days_left)
-            
-            # 格式化到期日期
-            expiry_date_display = DateUtils.format_date(doc.expiry_date) if doc.expiry_date else '未知'
-            
-            # 生成表格行HTML
-            row_html = self.template_config.table_row_html.format(
-                person_name=doc.person_name,
-                document_type=doc.document_type,
-                expiry_date=expiry_date_display,
-                days_left=days_left_display,
-                remarks=doc.remarks or '',
-                color=color
-            )
-            table_rows.append(row_html)
+        # 热点方法绑定为局部变量，避免每行重复查找属性
+        render_row = self._row_template.render
+        get_color = self.reminder_logic.get_display_color
+        format_days = self._format_days_left_display
+        format_date = DateUtils.format_date
         
-        # 拼接所有表格行
-        table_rows_html = '\n'.join(table_rows)
-        
-        # 生成完整的邮件正文
-        html_body = self.template_config.body_html.format(
-            table_rows=table_rows_html
+        # 生成所有表格行（显示颜色在状态计算时已预先得出）
+        rows = (
+            render_row({
+                'person_name': doc.person_name,
+                'document_type': doc.document_type,
+                'expiry_date': _expiry_text(doc.expiry_date, format_date),
+                'days_left': format_days(doc.days_left),
+                'remarks': doc.remarks or '',
+                'color': doc.display_color or get_color(doc.days_left)
+            })
+            for doc in reminder_documents
         )
+        body_fields = {'today_date': today_str or DateUtils.get_today_str('%Y-%m-%d')}
+        
+        if self._body_parts is None:
+            body_fields['table_rows'] = '\n'.join(rows)
+            return self._body_template.render(body_fields)
+        
+        # 正文前后两段和各表格行依次写入缓冲区，不再生成完整的表格行中间字符串
+        prefix, suffix = self._body_parts
+        buffer = io.StringIO()
+        write = buffer.write
+        write(prefix.render(body_fields))
+        for index, row in enumerate(rows):
+            if index:
+                write('\n')
+            write(row)
+        write(suffix.render(body_fields))
         
-        return html_body
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _split_body_template(body_html: str) -> Optional[Tuple[CompiledTemplate, CompiledTemplate]]:
+        """
+        在{table_rows}占位符处把正文模板拆成前后两段
+
+        Args:
+            body_html: 正文模板
+
+        Returns:
+            (前段模板, 后段模板)，占位符不唯一或拆分后无法独立编译时返回None
+        """
+        try:
+            fields = [field for _, field, _, _ in string.Formatter().parse(body_html or '')]
+        except ValueError:
+            return None
+        if fields.count('table_rows') != 1:
+            return None
+
+        prefix, _, suffix = body_html.partition('{table_rows}')
+        parts = (CompiledTemplate(prefix), CompiledTemplate(suffix))
+        if not all(part.is_precompiled for part in parts):
+            return None
+        return parts
     
     def _format_days_left_display(self, days_left: Optional[int]) -> str:
         """
@@ -206,16 +643,7 @@ class EmailSender:
         Returns:
             格式化的显示文本
         """
-        if days_left is None:
-            return "未知"
-        elif days_left < 0:
-            return f"已过期 {abs(days_left)} 天"
-        elif days_left == 0:
-            return "今天到期"
-        elif days_left == 1:
-            return "明天到期"
-        else:
-            return f"{days_left} 天后到期"
+        return _days_left_display(days_left)
     
     def _create_email_message(self, subject: str, html_body: str, server_config: SmtpServerConfig) -> MIMEMultipart:
         """
@@ -263,11 +691,27 @@ class EmailSender:
 
         self.logger.info(f"开始尝试发送邮件，共配置 {total_servers} 个SMTP服务器")
 
-        # 解析收件人（支持多个收件人，逗号分隔）
-        receivers = [email.strip() for email in self.email_config.receiver_email.split(',')]
+        receivers = self._receivers
+
+        # 邮件只序列化一次，各服务器仅替换From头，切换服务器时无需重新生成整封邮件
+        payload = self._serialize_without_from(message)
+
+        # 尚未送达的收件人，切换服务器时只重发给这些收件人，避免已送达的收件人收到重复邮件
+        remaining = set(receivers)
+
+        # 所有服务器同时开始建立连接，再按优先级依次使用：
+        # 主服务器不可达时，备用服务器的连接已在等待期间建立好，无需再逐个等待超时
+        # 主服务器的预热连接仍在建立时直接等待它，不再重复连接
+        warmup = self._take_warmup()
+        if total_servers > 1:
+            connections = self._connect_concurrently(servers[1:] if warmup else servers)
+            if warmup:
+                connections.insert(0, warmup)
+        else:
+            connections = [warmup]
 
         # 依次尝试每个服务器
-        for i, server_config in enumerate(servers):
+        for i, (server_config, connection) in enumerate(zip(servers, connections)):
             server_index = i + 1
             is_primary = (i == 0)
 
@@ -276,16 +720,21 @@ class EmailSender:
                 self.logger.info(f"  地址: {server_config.smtp_server}:{server_config.smtp_port}")
                 self.logger.info(f"  用户: {server_config.smtp_user}")
 
-                # 尝试发送邮件
-                success = self._send_email_via_server(
+                # 尝试发送邮件（只发给尚未送达的收件人）
+                accepted, _ = self._send_email_via_server(
                     server_config,
-                    message,
-                    receivers,
-                    is_primary
+                    payload,
+                    [r for r in receivers if r in remaining],
+                    is_primary,
+                    connection
                 )
+                remaining -= accepted
 
-                if success:
+                if not remaining:
                     self.logger.info(f"✓ 邮件通过服务器 [{server_config.name}] 发送成功")
+                    # 未用到的后台连接建立完成后归还连接池，供后续发送复用
+                    for unused in connections[server_index:]:
+                        self._return_when_ready(unused)
                     return True
                 else:
                     # 发送失败，继续尝试下一个服务器
@@ -301,167 +750,279 @@ class EmailSender:
                 else:
                     self.logger.error("所有邮件服务器均尝试失败")
 
+        # 部分收件人已送达时视为发送成功（与单台服务器部分拒收的处理一致）
+        if len(remaining) < len(receivers):
+            self.logger.warning(f"以下收件人未能送达: {', '.join(sorted(remaining))}")
+            return True
+
         # 所有服务器都尝试失败
         self._log_failure_suggestions(servers)
         return False
 
+    @staticmethod
+    def _serialize_without_from(message: MIMEMultipart) -> bytes:
+        """
+        将邮件序列化为SMTP传输格式（CRLF换行），不含From头
+
+        Args:
+            message: 邮件消息对象
+
+        Returns:
+            序列化后的邮件字节串
+        """
+        del message['From']
+        return message.as_bytes(policy=message.policy.clone(linesep='\r\n'))
+
+    def _connect_concurrently(self, servers: List[SmtpServerConfig]) -> List[Future]:
+        """
+        在后台线程中同时向所有服务器建立连接
+
+        使用守护线程，未用到的慢速连接不会阻塞程序退出。
+
+        Args:
+            servers: SMTP服务器配置列表
+
+        Returns:
+            与服务器列表一一对应的连接Future
+        """
+        return [self._connect_in_background(server_config) for server_config in servers]
+
+    def _connect_in_background(self, server_config: SmtpServerConfig) -> Future:
+        """
+        在守护线程中从连接池获取到指定服务器的连接
+
+        Args:
+            server_config: SMTP服务器配置
+
+        Returns:
+            连接Future
+        """
+        future: Future = Future()
+
+        def connect():
+            try:
+                future.set_result(self._pool.acquire(server_config, self._connect))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=connect, name=f"smtp-connect-{server_config.name}", daemon=True).start()
+        return future
+
+    def warmup(self) -> None:
+        """
+        在后台预先建立到主服务器的连接
+
+        连接建立并认证后留给首次发送使用，无需再等待握手和登录；
+        预热失败只记录日志，发送时会重新连接。
+        """
+        server_config = self.email_config.primary_server
+        with self._warmup_lock:
+            if self._warmup is not None:
+                return
+            self.logger.debug(f"开始预热服务器 [{server_config.name}] 的连接")
+            future = self._connect_in_background(server_config)
+            self._warmup = future
+
+        def on_done(done: Future) -> None:
+            if done.exception() is not None:
+                self.logger.warning(f"服务器 [{server_config.name}] 连接预热失败: {done.exception()}")
+
+        future.add_done_callback(on_done)
+
+    def _take_warmup(self) -> Optional[Future]:
+        """
+        取出预热连接（只能取出一次）
+
+        预热已失败时返回None，由连接池重新连接。
+
+        Returns:
+            预热连接Future
+        """
+        with self._warmup_lock:
+            future, self._warmup = self._warmup, None
+        if future is None or (future.done() and future.exception() is not None):
+            return None
+        return future
+
+    def _return_when_ready(self, connection: Optional[Future]) -> None:
+        """
+        未用到的后台连接建立完成后归还连接池（不计入发送数量）
+
+        Args:
+            connection: 后台建立的连接
+        """
+        if connection is None:
+            return
+
+        def on_done(done: Future) -> None:
+            if done.exception() is None:
+                self._pool.release(done.result(), sent=0)
+
+        connection.add_done_callback(on_done)
+
     def _send_email_via_server(
         self,
         server_config: SmtpServerConfig,
-        message: MIMEMultipart,
+        payload: bytes,
         receivers: List[str],
-        is_primary: bool
-    ) -> bool:
+        is_primary: bool,
+        connection: Optional[Future] = None
+    ) -> Tuple[Set[str], Set[str]]:
         """
         通过指定服务器发送邮件
 
         Args:
             server_config: SMTP服务器配置
-            message: 邮件消息对象
+            payload: 不含From头的已序列化邮件
             receivers: 收件人列表
             is_primary: 是否为主服务器
+            connection: 已在后台建立的连接，为None时从连接池获取
 
         Returns:
-            是否发送成功
+            (接收成功的收件人, 未送达的收件人)，发送失败时全部收件人均未送达
         """
         server = None
+        send_ok = False
 
         try:
-            # 创建SMTP连接
-            if server_config.use_ssl:
-                # 使用SSL连接
-                self.logger.debug(f"使用SSL连接到 {server_config.smtp_server}:{server_config.smtp_port}")
-                context = ssl.create_default_context()
-                server = smtplib.SMTP_SSL(
-                    server_config.smtp_server,
-                    server_config.smtp_port,
-                    context=context,
-                    timeout=30
-                )
+            # 从连接池借出已认证的连接（没有可用连接时新建）
+            if connection is not None:
+                server = connection.result()
             else:
-                # 使用普通连接
-                self.logger.debug(f"使用普通连接到 {server_config.smtp_server}:{server_config.smtp_port}")
-                server = smtplib.SMTP(
-                    server_config.smtp_server,
-                    server_config.smtp_port,
-                    timeout=30
-                )
-
-                # 如果配置了TLS，启用TLS
-                if server_config.use_tls:
-                    self.logger.debug("启用TLS加密")
-                    server.starttls(context=ssl.create_default_context())
-
-            self.logger.debug(f"服务器 [{server_config.name}] 连接成功，开始认证")
+                server = self._pool.acquire(server_config, self._connect)
 
-            # 登录邮箱
-            server.login(server_config.smtp_user, server_config.smtp_password)
-
-            self.logger.debug(f"服务器 [{server_config.name}] 认证成功，开始发送邮件")
+            self.logger.debug(f"服务器 [{server_config.name}] 连接就绪，开始发送邮件")
 
-            # 更新邮件的发件人信息（使用当前服务器的配置）
+            # 加上当前服务器的发件人信息
             # QQ邮箱等国内服务要求From头必须是纯邮箱地址
-            if 'From' in message:
-                del message['From']
-            message['From'] = server_config.smtp_user
+            from_header = f"From: {server_config.smtp_user}\r\n".encode('utf-8')
 
             # 发送邮件
-            text = message.as_string()
-            server.sendmail(server_config.smtp_user, receivers, text)
+            # 部分收件人被拒绝时sendmail不抛异常，而是返回被拒绝的收件人
+            refused = set(server.sendmail(server_config.smtp_user, receivers, _MessagePayload(from_header, payload)))
+            accepted = set(receivers) - refused
 
-            self.logger.debug(f"服务器 [{server_config.name}] 邮件发送成功，收件人: {', '.join(receivers)}")
+            self.logger.debug(f"服务器 [{server_config.name}] 邮件发送成功，收件人: {', '.join(sorted(accepted))}")
+            if refused:
+                self.logger.warning(f"服务器 [{server_config.name}] 拒绝了部分收件人: {', '.join(sorted(refused))}")
 
-            # 关闭连接
-            server.quit()
-
-            return True
+            # 连接归还连接池，供后续发送复用
+            self._pool.release(server)
+            send_ok = True
+            return accepted, refused
 
         except smtplib.SMTPAuthenticationError as e:
             error_msg = f"服务器 [{server_config.name}] SMTP认证失败"
             suggestion = self._get_auth_error_suggestion(server_config, is_primary)
             self.logger.error(f"{error_msg}: {e}\n  建议解决方法: {suggestion}")
-            return False
+            return set(), set(receivers)
 
         except smtplib.SMTPRecipientsRefused as e:
             self.logger.error(f"服务器 [{server_config.name}] 收件人被拒绝: {e}")
             self.logger.error("  请检查收件人邮箱地址是否正确")
-            return False
+            return set(), set(receivers)
 
         except smtplib.SMTPServerDisconnected as e:
             error_msg = f"服务器 [{server_config.name}] 连接断开"
             suggestion = self._get_connection_error_suggestion(server_config, is_primary)
             self.logger.error(f"{error_msg}: {e}\n  建议解决方法: {suggestion}")
-            return False
+            return set(), set(receivers)
 
         except smtplib.SMTPConnectError as e:
             error_msg = f"无法连接到服务器 [{server_config.name}]"
             suggestion = self._get_connection_error_suggestion(server_config, is_primary)
             self.logger.error(f"{error_msg}: {e}\n  建议解决方法: {suggestion}")
-            return False
+            return set(), set(receivers)
 
         except smtplib.SMTPException as e:
             self.logger.error(f"服务器 [{server_config.name}] SMTP错误: {e}")
-            return False
+            return set(), set(receivers)
 
         except OSError as e:
             error_msg = f"服务器 [{server_config.name}] 网络错误"
             suggestion = self._get_network_error_suggestion(server_config, is_primary)
             self.logger.error(f"{error_msg}: {e}\n  建议解决方法: {suggestion}")
-            return False
+            return set(), set(receivers)
 
         except Exception as e:
             self.logger.error(f"服务器 [{server_config.name}] 发送邮件时发生未知错误: {e}")
-            import traceback
-            self.logger.debug(f"错误堆栈:\n{traceback.format_exc()}")
-            return False
+            # 由日志处理器负责格式化堆栈，未开启DEBUG级别时不做任何格式化
+            self.logger.debug("错误堆栈:", exc_info=True)
+            return set(), set(receivers)
 
         finally:
-            # 确保连接被关闭
-            if server is not None:
-                try:
-                    server.quit()
-                except:
-                    pass
+            # 发送出错时丢弃该连接，避免复用已失效的连接
+            if not send_ok and server is not None:
+                self._pool.discard(server)
 
-    def _get_auth_error_suggestion(self, server_config: SmtpServerConfig, is_primary: bool) -> str:
-        """获取认证错误的解决建议"""
-        if 'gmail.com' in server_config.smtp_server.lower():
-            return (
-                "1. Gmail在国内可能无法访问，建议配置QQ邮箱等国内邮件服务作为备用服务器\n"
-                "   2. 请确认使用的是应用专用密码，而非Google账户密码\n"
-                "   3. 前往 Google账户设置 -> 安全性 -> 两步验证 -> 应用专用密码 生成密码"
-            )
-        elif 'qq.com' in server_config.smtp_server.lower():
-            return (
-                "1. 请确保已开启QQ邮箱SMTP服务\n"
-                "   2. 登录QQ邮箱 -> 设置 -> 账户 -> SMTP服务\n"
-                "   3. 使用授权码（而非登录密码）：\n"
-                "      登录QQ邮箱 -> 设置 -> 账户 -> 生成授权码"
-            )
-        elif '163.com' in server_config.smtp_server.lower():
-            return (
-                "1. 请确保已开启163邮箱SMTP服务\n"
-                "   2. 使用授权码（而非登录密码）\n"
-                "   3. 检查是否因安全问题被暂时锁定"
+    def _connect(self, server_config: SmtpServerConfig) -> smtplib.SMTP:
+        """
+        建立到指定服务器的连接并完成认证
+
+        Args:
+            server_config: SMTP服务器配置
+
+        Returns:
+            已认证的SMTP连接
+        """
+        if server_config.use_ssl:
+            # 使用SSL连接
+            self.logger.debug(f"使用SSL连接到 {server_config.smtp_server}:{server_config.smtp_port}")
+            server = _NoDelaySMTP_SSL(
+                server_config.smtp_server,
+                server_config.smtp_port,
+                context=_ssl_context(),
+                timeout=30
             )
         else:
-            return "请检查用户名和密码/授权码是否正确"
+            # 使用普通连接
+            self.logger.debug(f"使用普通连接到 {server_config.smtp_server}:{server_config.smtp_port}")
+            server = _NoDelaySMTP(
+                server_config.smtp_server,
+                server_config.smtp_port,
+                timeout=30
+            )
+
+        try:
+            # 如果配置了TLS，启用TLS
+            if not server_config.use_ssl and server_config.use_tls:
+                self.logger.debug("启用TLS加密")
+                server.starttls(context=_ssl_context())
+
+            self.logger.debug(f"服务器 [{server_config.name}] 连接成功，开始认证")
+
+            # 登录邮箱
+            server.login(server_config.smtp_user, server_config.smtp_password)
+        except BaseException:
+            _ConnectionPool._close(server, graceful=False)
+            raise
+
+        self.logger.debug(f"服务器 [{server_config.name}] 认证成功")
+        return server
+
+    def close(self) -> None:
+        """
+        关闭本发送器所用服务器的空闲SMTP连接
+
+        连接池为全局共享，其他发送器正在使用的连接不受影响；所有连接在程序退出时统一关闭。
+        """
+        self._return_when_ready(self._take_warmup())
+        self._pool.close_idle(set(self._vendors))
+
+    def _vendor(self, server_config: SmtpServerConfig) -> str:
+        """服务器所属的邮件服务商（初始化时已按服务器解析）"""
+        vendor = self._vendors.get(_ConnectionPool.key(server_config))
+        return vendor if vendor is not None else _smtp_vendor(server_config.smtp_server)
+
+    def _get_auth_error_suggestion(self, server_config: SmtpServerConfig, is_primary: bool) -> str:
+        """获取认证错误的解决建议"""
+        return _AUTH_ERROR_SUGGESTIONS[self._vendor(server_config)]
 
     def _get_connection_error_suggestion(self, server_config: SmtpServerConfig, is_primary: bool) -> str:
         """获取连接错误的解决建议"""
-        if 'gmail.com' in server_config.smtp_server.lower():
-            return (
-                "1. Gmail在国内无法直接访问，建议使用QQ邮箱等国内邮件服务\n"
-                "   2. 如果需要使用Gmail，请配置VPN或代理\n"
-                "   3. 建议在config.yaml中将QQ邮箱配置为primary_server"
-            )
-        else:
-            return (
-                "1. 请检查网络连接是否正常\n"
-                "   2. 检查防火墙设置\n"
-                "   3. 确认SMTP服务器地址和端口配置正确\n"
-                f"   4. 当前配置端口: {server_config.smtp_port}"
-            )
+        if self._vendor(server_config) == 'gmail':
+            return _GMAIL_CONNECTION_SUGGESTION
+        return _CONNECTION_SUGGESTION_TEMPLATE.format(port=server_config.smtp_port)
 
     def _get_network_error_suggestion(self, server_config: SmtpServerConfig, is_primary: bool) -> str:
         """获取网络错误的解决建议"""
@@ -478,18 +1039,8 @@ class EmailSender:
             server_type = "主服务器" if is_primary else f"备用服务器{i}"
             self.logger.error(f"\n{server_type}: [{server.name}]")
 
-            if 'gmail.com' in server.smtp_server.lower():
-                self.logger.error("  问题: Gmail在国内无法直接访问")
-                self.logger.error("  建议: 请配置QQ邮箱、163邮箱等国内邮件服务")
-            elif 'qq.com' in server.smtp_server.lower():
-                self.logger.error("  问题: QQ邮箱认证失败或服务未开启")
-                self.logger.error("  建议: ")
-                self.logger.error("    1. 登录QQ邮箱 -> 设置 -> 账户 -> 开启SMTP服务")
-                self.logger.error("    2. 生成授权码（非登录密码）")
-                self.logger.error("    3. 在config.yaml中更新授权码")
-            else:
-                self.logger.error("  问题: 连接或认证失败")
-                self.logger.error(f"  建议: 检查 {server.name} 的SMTP配置和网络连接")
+            for line in _FAILURE_SUMMARY.get(self._vendor(server), _FAILURE_SUMMARY_OTHER):
+                self.logger.error(line.replace("{name}", server.name))
 
         self.logger.error("\n" + "=" * 70)
         self.logger.error("如需帮助，请查看: https://github.com/your-repo/docs/email-troubleshooting.md")
@@ -537,9 +1088,8 @@ class EmailSender:
             errors.append("收件人邮箱不能为空")
         else:
             # 简单验证邮箱格式
-            receivers = [email.strip() for email in self.email_config.receiver_email.split(',')]
-            for email in receivers:
-                if '@' not in email or '.' not in email:
+            for email in self._receivers:
+                if not _EMAIL_RE.fullmatch(email):
                     errors.append(f"邮箱格式无效: {email}")
 
         # 验证模板配置
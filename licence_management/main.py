@@ -4,17 +4,22 @@
 这是系统的主程序入口，提供命令行接口和核心业务流程控制。
 """
 
+import os
 import sys
 import argparse
-from typing import List, Optional
-from datetime import datetime
+import logging
+from collections import Counter
+from functools import cached_property
+from typing import List, Optional, Tuple
+from datetime import date, datetime
 
 from .config.config_manager import ConfigManager
 from .data.csv_processor import CSVProcessor, PersonDocument
 from .business.reminder_logic import ReminderLogic
 from .email.email_sender import EmailSender
-from .utils.logger import get_logger, setup_default_logger
+from .utils.logger import get_logger, get_user_logger, setup_default_logger
 from .utils.date_utils import DateUtils
+from .utils.template_utils import compile_template
 
 
 class LicenceManagementApp:
@@ -29,10 +34,15 @@ class LicenceManagementApp:
         """
         self.config_file = config_file
         self.logger = None
+        self.user_logger = None
         self.config_manager = None
         self.csv_processor = None
         self.reminder_logic = None
-        self.email_sender = None
+        # 本次运行的日期（初始化时取一次，整个运行过程共用）
+        self.run_date: Optional[date] = None
+        self.run_date_str: Optional[str] = None
+        # 已计算状态的证件数据缓存：(数据文件键, 状态阈值, 计算日期, 证件列表)
+        self._doc_cache: Optional[Tuple[Tuple, int, date, List[PersonDocument]]] = None
         
     def initialize(self) -> bool:
         """
@@ -42,24 +52,31 @@ class LicenceManagementApp:
             是否初始化成功
         """
         try:
+            # 记录本次运行的日期
+            self.run_date = DateUtils.get_today()
+            self.run_date_str = DateUtils.format_date(self.run_date, '%Y%m%d')
+            
             # 初始化配置管理器
             self.config_manager = ConfigManager(self.config_file)
             config = self.config_manager.load_config()
             
             # 初始化日志记录器
             if config.log_file:
-                log_file = config.log_file.format(date=DateUtils.get_today_str('%Y%m%d'))
+                log_file = compile_template(config.log_file).render({'date': self.run_date_str})
                 self.logger = get_logger("licence_management", config.log_level, log_file)
             else:
                 self.logger = get_logger("licence_management", config.log_level)
+            self.user_logger = get_user_logger("licence_management")
             
             self.logger.info("=" * 60)
             self.logger.info("人员证件有效期管控系统启动")
             self.logger.info(f"配置文件: {self.config_file}")
             self.logger.info(f"数据文件: {config.data_file}")
             
-            # 验证配置
-            config_errors = self.config_manager.validate_config()
+            # 验证配置（设置环境变量LICENCE_SKIP_VALIDATE时复用加载配置时缓存的验证结果）
+            config_errors = self.config_manager.validate_config(
+                force=not os.environ.get('LICENCE_SKIP_VALIDATE')
+            )
             if config_errors:
                 self.logger.error("配置验证失败:")
                 for error in config_errors:
@@ -71,15 +88,6 @@ class LicenceManagementApp:
             # 初始化其他组件
             self.csv_processor = CSVProcessor(self.logger)
             self.reminder_logic = ReminderLogic(self.logger)
-            self.email_sender = EmailSender(config.email, config.mail_template, self.logger)
-            
-            # 验证邮件配置
-            email_errors = self.email_sender.validate_email_config()
-            if email_errors:
-                self.logger.warning("邮件配置验证失败:")
-                for error in email_errors:
-                    self.logger.warning(f"  - {error}")
-                self.logger.warning("邮件功能可能不可用")
             
             self.logger.info("应用初始化完成")
             return True
@@ -88,9 +96,31 @@ class LicenceManagementApp:
             if self.logger:
                 self.logger.error(f"应用初始化失败: {e}")
             else:
-                print(f"应用初始化失败: {e}")
+                # 日志记录器尚未创建：交给模块记录器，由调用方配置的处理器（如定时任务日志）记录；
+                # 未配置任何处理器时logging会将其输出到标准错误
+                logging.getLogger(__name__).error(f"应用初始化失败: {e}")
             return False
     
+    @cached_property
+    def email_sender(self) -> EmailSender:
+        """
+        邮件发送器（首次需要发送邮件时创建并验证邮件配置）
+        
+        生成报告、创建示例数据等不发送邮件的模式无需创建。
+        """
+        config = self.config_manager.config
+        email_sender = EmailSender(config.email, config.mail_template, self.logger)
+        
+        # 验证邮件配置
+        email_errors = email_sender.validate_email_config()
+        if email_errors:
+            self.logger.warning("邮件配置验证失败:")
+            for error in email_errors:
+                self.logger.warning(f"  - {error}")
+            self.logger.warning("邮件功能可能不可用")
+        
+        return email_sender
+    
     def run_reminder(self) -> bool:
         """
         运行邮件提醒流程
@@ -101,26 +131,21 @@ class LicenceManagementApp:
         self.logger.info("开始执行邮件提醒流程")
         
         try:
-            config = self.config_manager.config
+            days_before_expiry = self.config_manager.config.reminder.days_before_expiry
+            # 先创建邮件发送器，开启连接预热时可与数据读取同时进行
+            email_sender = self.email_sender
             
-            # 读取CSV数据
-            self.logger.info(f"读取CSV数据文件: {config.data_file}")
-            documents = self.csv_processor.read_csv_file(config.data_file)
+            # 读取CSV数据并计算证件状态（数据文件未变化时复用上次结果）
+            documents = self._load_documents()
             
             if not documents:
                 self.logger.warning("没有找到任何证件数据")
                 return True
             
-            # 计算证件状态
-            documents = self.reminder_logic.calculate_document_status(
-                documents, 
-                config.report.days_until_expiring_threshold
-            )
-            
             # 筛选需要提醒的证件
             reminder_documents = self.reminder_logic.filter_reminder_documents(
                 documents, 
-                config.reminder.days_before_expiry
+                days_before_expiry
             )
             
             if not reminder_documents:
@@ -134,7 +159,7 @@ class LicenceManagementApp:
                            f"即将过期{summary['expiring_count']}个")
             
             # 发送提醒邮件
-            success = self.email_sender.send_reminder_email(reminder_documents)
+            success = email_sender.send_reminder_email(reminder_documents)
             
             if success:
                 self.logger.info("邮件提醒流程执行成功")
@@ -147,6 +172,51 @@ class LicenceManagementApp:
             self.logger.error(f"邮件提醒流程执行失败: {e}")
             return False
     
+    def _load_documents(self) -> List[PersonDocument]:
+        """
+        读取CSV数据并计算证件状态
+        
+        以数据文件的（路径, 修改时间, 大小）为键缓存结果，同一进程内多次运行时
+        数据文件、状态阈值和日期均未变化则直接复用，不再重新读取和计算。
+        
+        Returns:
+            已计算状态的证件文档列表
+        """
+        config = self.config_manager.config
+        data_file = config.data_file
+        threshold = config.report.days_until_expiring_threshold
+        today = self.run_date or DateUtils.get_today()
+        
+        try:
+            st = os.stat(data_file)
+            file_key = (os.path.abspath(data_file), st.st_mtime_ns, st.st_size)
+        except OSError:
+            # 文件不存在等情况交给read_csv_file报告
+            file_key = None
+        
+        cache = self._doc_cache
+        if file_key is not None and cache is not None and cache[:3] == (file_key, threshold, today):
+            self.logger.info(f"CSV数据文件未变化，复用已读取的数据: {data_file}")
+            documents = cache[3]
+            # 清除上次提醒流程设置的提醒标记，使结果与重新读取时一致
+            for doc in documents:
+                doc.needs_reminder = None
+            return documents
+        
+        self.logger.info(f"读取CSV数据文件: {data_file}")
+        documents = self.csv_processor.read_csv_file(data_file)
+        
+        if documents:
+            documents = self.reminder_logic.calculate_document_status(
+                documents, 
+                threshold,
+                today=today,
+                frame=self.csv_processor.frame
+            )
+        
+        self._doc_cache = (file_key, threshold, today, documents) if file_key is not None else None
+        return documents
+    
     def run_report(self, output_file: Optional[str] = None) -> bool:
         """
         运行状态报告生成流程
@@ -160,26 +230,19 @@ class LicenceManagementApp:
         self.logger.info("开始执行状态报告生成流程")
         
         try:
-            config = self.config_manager.config
+            output_filename = self.config_manager.config.report.output_filename
             
-            # 读取CSV数据
-            self.logger.info(f"读取CSV数据文件: {config.data_file}")
-            documents = self.csv_processor.read_csv_file(config.data_file)
+            # 读取CSV数据并计算证件状态（数据文件未变化时复用上次结果）
+            documents = self._load_documents()
             
             if not documents:
                 self.logger.warning("没有找到任何证件数据")
                 return True
             
-            # 计算证件状态
-            documents = self.reminder_logic.calculate_document_status(
-                documents, 
-                config.report.days_until_expiring_threshold
-            )
-            
             # 生成输出文件名
             if output_file is None:
-                today = DateUtils.get_today_str('%Y%m%d')
-                output_file = config.report.output_filename.format(date=today)
+                today = self.run_date_str or DateUtils.get_today_str('%Y%m%d')
+                output_file = compile_template(output_filename).render({'date': today})
             
             # 写入状态报告
             self.csv_processor.write_csv_file(
@@ -189,19 +252,11 @@ class LicenceManagementApp:
             )
             
             # 统计报告
-            status_counts = {}
-            for doc in documents:
-                status = doc.status or "未知"
-                status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = Counter(doc.status or "未知" for doc in documents)
             
-            self.logger.info(f"状态报告生成完成: {output_file}")
-            self.logger.info(f"证件状态统计: {status_counts}")
-            
-            print(f"\n✅ 状态报告生成完成！")
-            print(f"📄 报告文件: {output_file}")
-            print(f"📊 证件状态统计:")
-            for status, count in status_counts.items():
-                print(f"   {status}: {count}个")
+            lines = ["✅ 状态报告生成完成！", f"📄 报告文件: {output_file}", "📊 证件状态统计:"]
+            lines.extend(f"   {status}: {count}个" for status, count in status_counts.items())
+            self.user_logger.info("\n".join(lines))
             
             return True
             
@@ -222,17 +277,14 @@ class LicenceManagementApp:
             success = self.email_sender.send_test_email()
             
             if success:
-                self.logger.info("测试邮件发送成功")
-                print("\n✅ 测试邮件发送成功！请检查您的邮箱。")
+                self.user_logger.info("✅ 测试邮件发送成功！请检查您的邮箱。")
             else:
-                self.logger.error("测试邮件发送失败")
-                print("\n❌ 测试邮件发送失败，请检查邮件配置。")
+                self.user_logger.error("❌ 测试邮件发送失败，请检查邮件配置。")
             
             return success
             
         except Exception as e:
-            self.logger.error(f"测试邮件发送失败: {e}")
-            print(f"\n❌ 测试邮件发送失败: {e}")
+            self.user_logger.error(f"❌ 测试邮件发送失败: {e}")
             return False
     
     def create_sample_data(self) -> bool:
@@ -248,9 +300,11 @@ class LicenceManagementApp:
             config = self.config_manager.config
             self.csv_processor.create_sample_csv(config.data_file)
             
-            print(f"\n✅ 示例数据文件创建完成！")
-            print(f"📄 数据文件: {config.data_file}")
-            print("🔍 您可以编辑此文件来添加实际的证件数据。")
+            self.user_logger.info("\n".join([
+                "✅ 示例数据文件创建完成！",
+                f"📄 数据文件: {config.data_file}",
+                "🔍 您可以编辑此文件来添加实际的证件数据。",
+            ]))
             
             return True
             
@@ -260,6 +314,10 @@ class LicenceManagementApp:
     
     def cleanup(self):
         """清理资源"""
+        if 'email_sender' in self.__dict__:
+            # 关闭复用的SMTP连接
+            self.email_sender.close()
+        
         if self.logger:
             self.logger.info("应用执行完成")
             self.logger.info("=" * 60)
@@ -2,5 +2,6 @@
 
 from .logger import get_logger
 from .date_utils import DateUtils
+from .template_utils import CompiledTemplate, compile_template
 
-__all__ = ['get_logger', 'DateUtils'] 
\ No newline at end of file
+__all__ = ['get_logger', 'DateUtils', 'CompiledTemplate', 'compile_template'] 
\ No newline at end of file
@@ -4,11 +4,35 @@
 提供日期格式转换、计算和验证功能。
 """
 
+import re
+from functools import lru_cache
 from datetime import datetime, date
-from typing import Optional, Union
+from typing import List, Optional, Union
+import numpy as np
 from dateutil.parser import parse as dateutil_parse
 
 
+# 标准的 YYYY-MM-DD 日期（最常见的格式，预编译后直接匹配）
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})', re.ASCII)
+
+
+@lru_cache(maxsize=4096)
+def _format_date_cached(date_obj: Union[date, datetime], format_str: str) -> str:
+    """按（日期, 格式）缓存strftime结果，重复的日期只格式化一次"""
+    if isinstance(date_obj, datetime):
+        date_obj = date_obj.date()
+    return date_obj.strftime(format_str)
+
+
+# 带分隔符的10位日期格式：(分隔符, 分隔符首次出现的位置) -> 格式
+_SEPARATED_FORMATS = {
+    ('-', 4): '%Y-%m-%d',
+    ('/', 4): '%Y/%m/%d',
+    ('/', 2): '%d/%m/%Y',
+    ('-', 2): '%d-%m-%Y',
+}
+
+
 class DateUtils:
     """日期处理工具类"""
 
@@ -28,6 +52,10 @@ class DateUtils:
     # 合理的日期范围
     MIN_REASONABLE_DATE = date(1900, 1, 1)
     MAX_REASONABLE_DATE = date(2100, 12, 31)
+
+    # 逐个尝试格式时的顺序：最近解析成功的格式排在最前
+    # （每次整体替换为新列表，正在遍历旧列表的调用不受影响）
+    _format_order: List[str] = list(SUPPORTED_FORMATS)
     
     @staticmethod
     def parse_date(date_str: str) -> Optional[date]:
@@ -43,6 +71,20 @@ class DateUtils:
         if not date_str or not isinstance(date_str, str):
             return None
 
+        # 同一批数据中到期日期大量重复，相同的字符串只解析一次
+        return _parse_date_cached(date_str)
+
+    @staticmethod
+    def _parse_date_uncached(date_str: str) -> Optional[date]:
+        """
+        解析日期字符串（不经过缓存）
+
+        Args:
+            date_str: 日期字符串
+
+        Returns:
+            解析成功返回date对象，失败返回None
+        """
         date_str = date_str.strip()
         if not date_str:
             return None
@@ -51,16 +93,48 @@ class DateUtils:
         if DateUtils._is_obviously_invalid(date_str):
             return None
 
-        # 首先尝试预定义格式
-        for fmt in DateUtils.SUPPORTED_FORMATS:
+        # YYYY-MM-DD 格式直接构造日期，无需逐个尝试格式
+        match = _ISO_DATE_RE.fullmatch(date_str)
+        if match:
+            try:
+                parsed = date(int(match[1]), int(match[2]), int(match[3]))
+                if DateUtils._is_reasonable_date(parsed):
+                    return parsed
+            except ValueError:
+                pass
+
+        # 根据长度和分隔符位置判断格式，只调用一次strptime
+        fmt = DateUtils._sniff_format(date_str)
+        if fmt is not None:
+            try:
+                parsed = datetime.strptime(date_str, fmt).date()
+                if DateUtils._is_reasonable_date(parsed):
+                    return parsed
+            except ValueError:
+                pass
+
+        # 按最近使用顺序尝试预定义格式：同一批数据的日期格式通常一致
+        # （各预定义格式互斥，尝试顺序不影响解析结果）
+        format_order = DateUtils._format_order
+        for index, fmt in enumerate(format_order):
             try:
                 parsed = datetime.strptime(date_str, fmt).date()
                 # 验证日期是否在合理范围内
                 if DateUtils._is_reasonable_date(parsed):
+                    if index:
+                        DateUtils._format_order = [fmt] + [f for f in format_order if f != fmt]
                     return parsed
             except ValueError:
                 continue
 
+        # 其他ISO 8601写法（如带时间的日期）直接用内置解析，比dateutil快得多
+        try:
+            parsed = datetime.fromisoformat(date_str).date()
+            if DateUtils._is_reasonable_date(parsed):
+                return parsed
+        except ValueError:
+            pass
+
         # 使用dateutil进行智能解析
         try:
             parsed = dateutil_parse(date_str).date()
@@ -71,6 +145,33 @@ class DateUtils:
 
         return None
 
+    @staticmethod
+    def _sniff_format(date_str: str) -> Optional[str]:
+        """
+        根据长度和分隔符位置判断日期字符串的格式
+
+        只对按该格式排列、且不可能被格式列表中更靠前的格式解析的字符串给出结果，
+        因此与逐个尝试格式的解析结果一致。
+
+        Args:
+            date_str: 去除首尾空白后的日期字符串
+
+        Returns:
+            对应的格式字符串，无法判断时返回None
+        """
+        length = len(date_str)
+        if length == 8:
+            return '%Y%m%d' if date_str.isdigit() else None
+        if length == 10:
+            if date_str[4] == date_str[7] and not date_str[4].isdigit():
+                return _SEPARATED_FORMATS.get((date_str[4], 4))
+            if date_str[2] == date_str[5] and not date_str[2].isdigit():
+                return _SEPARATED_FORMATS.get((date_str[2], 2))
+            return None
+        if '年' in date_str:
+            return '%Y年%m月%d日'
+        return None
+
     @staticmethod
     def _is_obviously_invalid(date_str: str) -> bool:
         """
@@ -111,18 +212,16 @@ class DateUtils:
         Returns:
             格式化后的日期字符串
         """
-        if isinstance(date_obj, datetime):
-            date_obj = date_obj.date()
-        
-        return date_obj.strftime(format_str)
+        return _format_date_cached(date_obj, format_str)
     
     @staticmethod
-    def calculate_days_left(expiry_date: Union[str, date, datetime]) -> int:
+    def calculate_days_left(expiry_date: Union[str, date, datetime], today: Optional[date] = None) -> int:
         """
         计算证件剩余有效天数
         
         Args:
             expiry_date: 到期日期（字符串、date对象或datetime对象）
+            today: 计算基准日期，为None时使用今天（批量计算时传入同一日期，避免重复取当前时间）
             
         Returns:
             剩余天数（负数表示已过期）
@@ -138,8 +237,41 @@ class DateUtils:
         elif isinstance(expiry_date, datetime):
             expiry_date = expiry_date.date()
         
-        today = date.today()
-        return (expiry_date - today).days
+        return DateUtils.days_between(today or date.today(), expiry_date)
+    
+    @staticmethod
+    def calculate_days_left_bulk(expiry_dates: np.ndarray, today: Optional[date] = None) -> np.ndarray:
+        """
+        批量计算证件剩余有效天数（一次数组减法完成）
+        
+        Args:
+            expiry_dates: 到期日期数组，datetime64[D] 或 date.toordinal() 得到的整数序数
+            today: 计算基准日期，为None时使用今天
+            
+        Returns:
+            剩余天数数组（int64；datetime64 输入中的 NaT 行结果无意义，需结合 np.isnat 判断）
+        """
+        if today is None:
+            today = date.today()
+        
+        expiry_dates = np.asarray(expiry_dates)
+        if expiry_dates.dtype.kind in 'iu':
+            return expiry_dates.astype(np.int64, copy=False) - today.toordinal()
+        return (expiry_dates.astype('datetime64[D]', copy=False) - np.datetime64(today, 'D')).astype(np.int64)
+    
+    @staticmethod
+    def days_between(start: date, end: date) -> int:
+        """
+        计算两个日期之间相差的天数
+        
+        Args:
+            start: 起始日期
+            end: 结束日期
+            
+        Returns:
+            相差天数（end早于start时为负数）
+        """
+        return (end - start).days
     
     @staticmethod
     def is_valid_date(date_str: str) -> bool:
@@ -166,11 +298,10 @@ class DateUtils:
         Returns:
             标准化后的日期字符串，解析失败返回None
         """
-        parsed_date = DateUtils.parse_date(date_str)
-        if parsed_date is None:
+        if not date_str or not isinstance(date_str, str):
             return None
         
-        return DateUtils.format_date(parsed_date, target_format)
+        return _normalize_date_cached(date_str, target_format)
     
     @staticmethod
     def get_today() -> date:
@@ -193,4 +324,19 @@ class DateUtils:
         Returns:
             格式化的今天日期字符串
         """
-        return DateUtils.format_date(DateUtils.get_today(), format_str) 
\ No newline at end of file
+        return DateUtils.format_date(DateUtils.get_today(), format_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[date]:
+    """按原始字符串缓存的日期解析结果"""
+    return DateUtils._parse_date_uncached(date_str)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date_cached(date_str: str, target_format: str) -> Optional[str]:
+    """按（原始字符串, 目标格式）缓存的日期标准化结果"""
+    parsed_date = _parse_date_cached(date_str)
+    if parsed_date is None:
+        return None
+    return DateUtils.format_date(parsed_date, target_format)
@@ -6,9 +6,32 @@
 
 import logging
 import os
+import sys
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from datetime import datetime
 from typing import Optional
 
+# 单个日志文件的最大字节数，超过后自动轮转
+MAX_LOG_BYTES = 1 * 1024 * 1024
+# 保留的历史日志文件数
+LOG_BACKUP_COUNT = 5
+# 文件日志的缓冲记录数（遇到WARNING及以上级别的记录时立即写出）
+LOG_BUFFER_CAPACITY = 256
+# 面向用户的提示信息所用子记录器的名称后缀
+USER_LOGGER_SUFFIX = "user"
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """始终写入当前的标准输出（运行期间重定向 sys.stdout 时同样生效）"""
+    
+    @property
+    def stream(self):
+        return sys.stdout
+    
+    @stream.setter
+    def stream(self, value):
+        pass
+
 
 def get_logger(name: str = "licence_management", 
                log_level: str = "INFO",
@@ -44,6 +67,9 @@ def get_logger(name: str = "licence_management",
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
+    # 用户提示信息已由用户记录器直接输出到标准输出，控制台不再重复显示
+    user_logger_name = f"{name}.{USER_LOGGER_SUFFIX}"
+    console_handler.addFilter(lambda record: record.name != user_logger_name)
     logger.addHandler(console_handler)
     
     # 文件处理器（如果指定了日志文件）
@@ -53,10 +79,51 @@ def get_logger(name: str = "licence_management",
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir, exist_ok=True)
             
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # 文件处理器自动轮转，记录先缓冲再批量写入，减少写文件次数
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=MAX_LOG_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        buffered_handler = MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.WARNING,
+            target=file_handler
+        )
+        buffered_handler.setLevel(level)
+        logger.addHandler(buffered_handler)
+    
+    return logger
+
+
+def get_user_logger(name: str = "licence_management") -> logging.Logger:
+    """
+    获取面向用户的提示信息记录器
+    
+    提示信息只格式化一次：原样输出到标准输出，同时传递给父记录器写入日志文件。
+    
+    Args:
+        name: 父日志记录器名称
+        
+    Returns:
+        用户提示信息记录器对象
+    """
+    logger = logging.getLogger(f"{name}.{USER_LOGGER_SUFFIX}")
+    
+    # 避免重复添加处理器
+    if logger.handlers:
+        return logger
+    
+    # 提示信息不受配置的日志级别限制，始终显示
+    logger.setLevel(logging.INFO)
+    
+    user_handler = _StdoutHandler()
+    user_handler.setLevel(logging.INFO)
+    user_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(user_handler)
     
     return logger
 
@@ -0,0 +1,80 @@
+"""
+模板工具模块
+
+提供 str.format 风格模板的预编译和缓存。
+"""
+
+import string
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+class CompiledTemplate:
+    """
+    预编译的模板
+
+    模板沿用 str.format 的 {字段名} 写法。初始化时解析一次，
+    将其转换为等价的 %-格式字符串，渲染时不再重复解析格式说明；
+    含格式说明、转换符或复杂字段的模板退回到 str.format_map。
+    """
+
+    def __init__(self, template: str):
+        """
+        解析并编译模板
+
+        Args:
+            template: str.format 格式的模板字符串
+        """
+        self.template = template
+        self._percent_template = self._compile(template)
+
+    @staticmethod
+    def _compile(template: str) -> Optional[str]:
+        """将模板转换为 %-格式字符串，无法等价转换时返回None"""
+        try:
+            parts = list(string.Formatter().parse(template))
+        except ValueError:
+            return None
+
+        chunks = []
+        for literal, field_name, format_spec, conversion in parts:
+            chunks.append(literal.replace('%', '%%'))
+            if field_name is None:
+                continue
+            if format_spec or conversion or not field_name.isidentifier():
+                return None
+            chunks.append(f"%({field_name})s")
+        return ''.join(chunks)
+
+    @property
+    def is_precompiled(self) -> bool:
+        """模板是否已转换为 %-格式字符串（为False时渲染退回到 str.format_map）"""
+        return self._percent_template is not None
+
+    def render(self, fields: Dict[str, Any]) -> str:
+        """
+        渲染模板
+
+        Args:
+            fields: 字段名到取值的映射
+
+        Returns:
+            渲染结果
+        """
+        if self._percent_template is None:
+            return self.template.format_map(fields)
+        return self._percent_template % fields
+
+
+@lru_cache(maxsize=128)
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    获取预编译的模板（同一模板字符串只编译一次）
+    
+    Args:
+        template: str.format 格式的模板字符串
+        
+    Returns:
+        预编译的模板
+    """
+    return CompiledTemplate(template)
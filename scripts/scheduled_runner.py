@@ -6,11 +6,11 @@
 """
 
 from __future__ import annotations
+import logging
 import sys
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
 
 PROJECT_ROOT = Path(__file__).parent.parent
 STATE_DIR = PROJECT_ROOT / "logs"
@@ -19,9 +19,25 @@ LOG_FILE = STATE_DIR / "scheduled_runner.log"
 MAX_LOG_BYTES = 1 * 1024 * 1024  # 1MB
 
 
+# 本进程内是否已确认状态目录存在
+_dir_ready = False
+
+
+def _ensure_state_dir() -> None:
+    global _dir_ready
+    if not _dir_ready:
+        STATE_DIR.mkdir(exist_ok=True)
+        _dir_ready = True
+
+
 def _rotate_log_if_needed() -> None:
-    STATE_DIR.mkdir(exist_ok=True)
-    if LOG_FILE.exists() and LOG_FILE.stat().st_size >= MAX_LOG_BYTES:
+    _ensure_state_dir()
+    # 一次stat同时判断文件是否存在及其大小
+    try:
+        size = LOG_FILE.stat().st_size
+    except FileNotFoundError:
+        return
+    if size >= MAX_LOG_BYTES:
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup = STATE_DIR / f"scheduled_runner_{ts}.log"
         try:
@@ -36,6 +52,20 @@ def _rotate_log_if_needed() -> None:
                 pass
 
 
+class _CollectingHandler(logging.Handler):
+    """把格式化后的日志行收集到内存，由调用方一次写入文件"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.lines.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
 def read_last_success_time() -> datetime | None:
     try:
         if not STATE_FILE.exists():
@@ -49,26 +79,48 @@ def read_last_success_time() -> datetime | None:
 
 
 def write_last_success_time(ts: datetime) -> None:
-    STATE_DIR.mkdir(exist_ok=True)
+    _ensure_state_dir()
     STATE_FILE.write_text(ts.isoformat(), encoding="utf-8")
 
 
 def run_licence_check() -> bool:
-    result = subprocess.run(
-        [sys.executable, "-m", "licence_management"],
-        cwd=PROJECT_ROOT,
-        capture_output=True,
-        text=True,
-    )
+    # 在当前进程内直接运行，省去启动新解释器和重新导入依赖的开销
+    # 配置文件、数据文件等相对路径都以项目根目录为基准
+    os.chdir(PROJECT_ROOT)
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from licence_management.main import LicenceManagementApp
+
     _rotate_log_if_needed()
-    with LOG_FILE.open("a", encoding="utf-8") as f:
+    # 程序日志经根记录器收集到内存，运行结束后与执行结果一起一次写入调度日志
+    handler = _CollectingHandler()
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(logging.Formatter(
+        "[%(asctime)s] %(levelname)-8s %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+
+    app = None
+    ok = False
+    try:
+        app = LicenceManagementApp()
+        ok = app.initialize() and app.run_reminder()
+    except Exception as e:
+        logging.getLogger("scheduled_runner").exception(f"执行出错: {e}")
+        ok = False
+    finally:
+        if app is not None:
+            app.cleanup()
+        root_logger.removeHandler(handler)
+        handler.close()
+
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"[{now}] returncode={result.returncode}\n")
-        if result.stdout:
-            f.write(result.stdout + "\n")
-        if result.stderr:
-            f.write(result.stderr + "\n")
-    return result.returncode == 0
+        handler.lines.append(f"[{now}] returncode={0 if ok else 1}")
+        with LOG_FILE.open("a", encoding="utf-8") as f:
+            f.write("\n".join(handler.lines) + "\n")
+    return ok
 
 
 def main():